@@ -34,8 +34,7 @@ from src.database.mongodb_client import mongodb_client
 from src.core.config import settings
 
 # MongoDB imports
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo.errors import CollectionInvalid, DuplicateKeyError
+from pymongo.errors import CollectionInvalid, DuplicateKeyError, OperationFailure
 import pymongo
 
 class MongoDBCollectionManager:
@@ -56,18 +55,13 @@ class MongoDBCollectionManager:
             return {"employee_schema": {"collections": {}}}
     
     async def connect(self):
-        """Connect to MongoDB"""
-        try:
-            self.client = AsyncIOMotorClient(settings.mongodb_connection_string)
-            self.db = self.client[settings.mongodb_database]
-            
-            # Test connection
-            await self.client.admin.command('ping')
-            print("✅ Connected to MongoDB Atlas")
-            return True
-        except Exception as e:
-            print(f"❌ MongoDB connection failed: {e}")
+        """Connect to MongoDB, reusing the shared client and its connection pool"""
+        if not await mongodb_client.connect():
             return False
+        
+        self.client = mongodb_client.client
+        self.db = mongodb_client.database
+        return True
     
     async def create_collection_with_schema(self, collection_name: str, schema_config: Dict[str, Any]) -> bool:
         """Create collection with JSON schema validation"""
@@ -510,10 +504,19 @@ class MongoDBCollectionManager:
                 }
             }
             
-            for collection_name in hr_collections:
+            # Fetch stats and index lists for every collection concurrently
+            results = await asyncio.gather(
+                *[self._get_collection_metadata(name) for name in hr_collections],
+                return_exceptions=True
+            )
+            
+            for collection_name, result in zip(hr_collections, results):
+                if isinstance(result, Exception):
+                    stats["collections"][collection_name] = {"error": str(result)}
+                    continue
+                
                 try:
-                    collection_stats = await self.db.command("collStats", collection_name)
-                    indexes = await self.db[collection_name].list_indexes().to_list(length=None)
+                    collection_stats, indexes = result
                     
                     col_stat = {
                         "document_count": collection_stats.get("count", 0),
@@ -532,10 +535,12 @@ class MongoDBCollectionManager:
                     stats["collections"][collection_name] = {"error": str(e)}
             
             # Print summary
-            print(f"   📚 Collections: {stats['total_collections']}")
-            print(f"   📄 Total Documents: {stats['summary']['total_documents']}")
-            print(f"   💾 Total Size: {stats['summary']['total_size_mb']:.2f} MB")
-            print(f"   📇 Total Indexes: {stats['summary']['total_indexes']}")
+            print("\n".join([
+                f"   📚 Collections: {stats['total_collections']}",
+                f"   📄 Total Documents: {stats['summary']['total_documents']}",
+                f"   💾 Total Size: {stats['summary']['total_size_mb']:.2f} MB",
+                f"   📇 Total Indexes: {stats['summary']['total_indexes']}"
+            ]))
             
             return stats
             
@@ -543,6 +548,13 @@ class MongoDBCollectionManager:
             print(f"❌ Failed to get collection statistics: {e}")
             return {"error": str(e)}
     
+    async def _get_collection_metadata(self, collection_name: str):
+        """Fetch collStats and index list for a collection in parallel"""
+        return await asyncio.gather(
+            self.db.command("collStats", collection_name),
+            self.db[collection_name].list_indexes().to_list(length=None)
+        )
+    
     async def repair_collection(self, collection_name: str) -> bool:
         """Repair and optimize a collection"""
         try:
@@ -558,7 +570,7 @@ class MongoDBCollectionManager:
             try:
                 await self.db.command("compact", collection_name)
                 print(f"   🗜️ Compacted collection")
-            except:
+            except OperationFailure:
                 print(f"   ⚠️ Compact not supported/needed")
             
             # Validate collection
@@ -569,7 +581,7 @@ class MongoDBCollectionManager:
                 else:
                     print(f"   ❌ Collection validation failed")
                     return False
-            except:
+            except OperationFailure:
                 print(f"   ⚠️ Validation not supported")
             
             print(f"✅ Collection '{collection_name}' repaired successfully")
@@ -582,8 +594,9 @@ class MongoDBCollectionManager:
     async def close_connection(self):
         """Close MongoDB connection"""
         if self.client:
-            self.client.close()
-            print("🔐 MongoDB connection closed")
+            await mongodb_client.disconnect()
+            self.client = None
+            self.db = None
 
 async def main():
     """Main function with command line interface"""
@@ -6,6 +6,7 @@ Advanced AI-powered HR analytics and insights generation
 
 import asyncio
 import json
+from collections import Counter
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 import sys
@@ -345,21 +346,13 @@ class HRAnalyticsAgent:
     
     def _analyze_diversity(self, employees: List[Dict]) -> Dict[str, Any]:
         """Analyze diversity metrics"""
-        genders = [emp.get("gender", "Unknown") for emp in employees]
-        locations = [emp.get("location", "Unknown") for emp in employees]
+        gender_dist = Counter(emp.get("gender", "Unknown") for emp in employees)
+        location_dist = Counter(emp.get("location", "Unknown") for emp in employees)
         ages = [emp.get("age", 0) for emp in employees if emp.get("age")]
         
-        gender_dist = {}
-        for gender in genders:
-            gender_dist[gender] = gender_dist.get(gender, 0) + 1
-        
-        location_dist = {}
-        for location in locations:
-            location_dist[location] = location_dist.get(location, 0) + 1
-        
         return {
-            "gender_distribution": gender_dist,
-            "location_distribution": location_dist,
+            "gender_distribution": dict(gender_dist),
+            "location_distribution": dict(location_dist),
             "avg_age": round(sum(ages) / len(ages), 1) if ages else 0,
             "age_groups": {
                 "young": len([a for a in ages if a < 30]),
@@ -4,9 +4,14 @@ Ollama-based AI client to replace Azure OpenAI dependencies
 Supports local LLM inference for HR Q&A system
 """
 
+import copy
+import hashlib
+import re
+import threading
 import requests
 import json
 import time
+from cachetools import LRUCache
 from typing import List, Dict, Any, Optional, Union
 import sys
 import os
@@ -14,6 +19,113 @@ import os
 # Add parent directories to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+# Embeddings kept in memory, keyed by (endpoint, model, sha256 of the text).
+# /api/embed returns unit-normalized vectors and /api/embeddings raw ones, so they never share entries
+EMBEDDING_CACHE_SIZE = 10000
+
+# Parsed intent analyses kept in memory, keyed by the normalized query text
+INTENT_CACHE_SIZE = 1024
+
+# Texts per /api/embed request in generate_batch_embeddings
+EMBEDDING_BATCH_SIZE = 256
+
+# Intent keywords for the fallback analysis, checked in order with one regex per intent.
+# Only the start of a keyword is anchored, so inflections ("counts", "totals") still match
+_FALLBACK_INTENT_PATTERNS = tuple(
+    (intent, re.compile(r"\b(?:" + "|".join(re.escape(word) for word in words) + ")"))
+    for intent, words in (
+        ("comparison", ("compare", "vs", "versus", "difference")),
+        ("ranking", ("top", "bottom", "highest", "lowest", "best", "worst")),
+        ("count_query", ("how many", "count", "total")),
+        ("analytics", ("average", "mean", "statistics")),
+    )
+)
+
+# Departments recognised by the keyword fallback, matched as whole words in one pass
+FALLBACK_DEPARTMENTS = ("Sales", "IT", "Operations", "HR", "Finance", "Legal", "Engineering", "Marketing", "Support")
+_DEPARTMENT_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(dept.lower()) for dept in FALLBACK_DEPARTMENTS) + r")\b"
+)
+
+# Static system prompts, built once rather than on every query
+INTENT_ANALYSIS_SYSTEM_PROMPT = """You are an expert HR analytics specialist. Analyze queries about employee data comprehensively.
+
+QUERY TYPES:
+- count_query: "How many", "Count of", "Total number"
+- comparison: "Compare X vs Y", "Difference between", "X versus Y"
+- ranking: "Top 10", "Bottom 5", "Highest", "Lowest", "Best", "Worst"
+- correlation: "High X with low Y", "Employees who have X and Y", complex relationships
+- recommendation: "Who needs", "Suggest", "Should we", "Recommend"
+- trend_analysis: "Recent", "Last 6 months", "New joiners", "Over time"
+- complex_filter: Multiple criteria (department AND skills AND experience)
+- analytics: Average, mean, median, statistics
+- employee_search: Simple "Find" or "Show me"
+
+DATA FIELDS:
+- Personal: age, gender, location
+- Employment: department, role, work_mode, employment_type, joining_date
+- Skills: certifications, courses_completed, learning_hours_ytd
+- Experience: total_experience_years, years_in_current_company, known_skills_count
+- Performance: performance_rating, awards, kpis_met_pct
+- Engagement: current_project, engagement_score, manager_feedback
+- Compensation: current_salary, bonus, total_ctc
+- Attendance: leave_balance, leave_days_taken, monthly_attendance_pct
+- Attrition: attrition_risk_score, exit_intent_flag
+
+Return JSON with:
+{
+    "intent": "query_type",
+    "entities": {
+        "departments": ["IT", "Sales"],
+        "roles": ["Developer"],
+        "skills": ["AWS", "Python"],
+        "locations": ["Remote"],
+        "experience_range": {"min": 5, "max": 10},
+        "performance_range": {"min": 4, "max": 5},
+        "age_range": {"min": 25, "max": 35}
+    },
+    "fields_to_analyze": ["performance_rating", "current_salary"],
+    "comparison_groups": ["IT", "Sales"],
+    "filters": {
+        "department": "IT",
+        "experience_min": 5
+    },
+    "sorting": {
+        "field": "performance_rating",
+        "order": "desc"
+    },
+    "aggregation_type": "average|count|max|min|sum",
+    "limit": 10
+}"""
+
+RESPONSE_SYSTEM_PROMPT = """You are a senior HR analytics executive providing board-level insights and strategic recommendations.
+
+        CRITICAL: Generate responses in a professional, executive-ready format suitable for C-level presentations.
+
+        Response Structure (MANDATORY):
+        1. EXECUTIVE SUMMARY (2-3 sentences max)
+        2. KEY FINDINGS (bullet points with specific metrics)
+        3. DETAILED ANALYSIS (professional table format)
+        4. STRATEGIC IMPLICATIONS (business impact)
+        5. RECOMMENDED ACTIONS (numbered priority list)
+
+        Formatting Requirements:
+        - Use professional business language
+        - Include specific metrics and percentages
+        - Create clean, readable tables with proper alignment
+        - Use bullet points for clarity
+        - Avoid casual language or informal tone
+        - Focus on business value and ROI
+        - Include comparative analysis where relevant
+
+        Table Format Example:
+        | Rank | Employee | Department | Role | Rating | KPIs | Status |
+        |------|----------|------------|------|--------|------|--------|
+        | 1    | Name     | Dept       | Role  | 4.2    | 85%  | Top    |
+
+        Tone: Professional, data-driven, strategic, executive-level
+        """
+
 class OllamaClient:
     """Client for interacting with Ollama models with smart model selection"""
     
@@ -62,6 +174,13 @@ class OllamaClient:
         # Available models cache
         self.available_models = []
         
+        # Embeddings already generated, so unchanged texts skip the server
+        self._embedding_cache = LRUCache(maxsize=EMBEDDING_CACHE_SIZE)
+        
+        # Intent analyses already produced; the lock guards it since callers run in worker threads
+        self._intent_cache = LRUCache(maxsize=INTENT_CACHE_SIZE)
+        self._intent_cache_lock = threading.Lock()
+        
         # Test connection on initialization
         self._test_connection()
     
@@ -71,36 +190,44 @@ class OllamaClient:
             response = requests.get(f"{self.base_url}/api/tags", timeout=5)
             if response.status_code == 200:
                 print("✅ Connected to Ollama server")
-                self._check_available_models()
+                self._check_available_models(response.json())
             else:
                 print(f"❌ Ollama server returned status {response.status_code}")
         except requests.exceptions.RequestException as e:
             print(f"❌ Failed to connect to Ollama server: {e}")
             print("💡 Make sure Ollama is running: ollama serve")
     
-    def _check_available_models(self):
-        """Check which models are available and update configuration"""
+    def _check_available_models(self, tags: Optional[Dict[str, Any]] = None):
+        """Check which models are available and update configuration
+        
+        Args:
+            tags: Already-fetched /api/tags payload; fetched here if not given
+        """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get('models', [])
-                self.available_models = [model['name'] for model in models]
-                
-                print(f"📋 Available models: {self.available_models}")
-                
-                # Validate embedding model
-                if not any('nomic-embed' in name for name in self.available_models):
-                    print("⚠️ nomic-embed-text not found for embeddings")
-                    self.embedding_model = None
-                else:
-                    # Find the exact embedding model name
-                    for model in self.available_models:
-                        if 'nomic-embed' in model:
-                            self.embedding_model = model
-                            break
-                
-                # Validate model configurations
-                self._validate_model_configs()
+            if tags is None:
+                response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+                if response.status_code != 200:
+                    return
+                tags = response.json()
+            
+            models = tags.get('models', [])
+            self.available_models = [model['name'] for model in models]
+            
+            print(f"📋 Available models: {self.available_models}")
+            
+            # Validate embedding model
+            if not any('nomic-embed' in name for name in self.available_models):
+                print("⚠️ nomic-embed-text not found for embeddings")
+                self.embedding_model = None
+            else:
+                # Find the exact embedding model name
+                for model in self.available_models:
+                    if 'nomic-embed' in model:
+                        self.embedding_model = model
+                        break
+            
+            # Validate model configurations
+            self._validate_model_configs()
                     
         except Exception as e:
             print(f"❌ Failed to check available models: {e}")
@@ -297,6 +424,11 @@ class OllamaClient:
             print("⚠️ No embedding model available")
             return [0.0] * 384  # Return zero vector
         
+        cache_key = ("embeddings", model, hashlib.sha256(text.encode("utf-8")).hexdigest())
+        embedding = self._embedding_cache.get(cache_key)
+        if embedding is not None:
+            return embedding
+        
         try:
             payload = {
                 "model": model,
@@ -311,6 +443,8 @@ class OllamaClient:
             
             if response.status_code == 200:
                 result = response.json()
+                # Only real embeddings are cached; the zero-vector fallbacks are retried next time
+                self._embedding_cache[cache_key] = result['embedding']
                 return result['embedding']
             else:
                 print(f"❌ Embedding generation failed: {response.status_code}")
@@ -320,26 +454,60 @@ class OllamaClient:
             print(f"❌ Embedding generation error: {e}")
             return [0.0] * 384
     
-    def generate_batch_embeddings(self, texts: List[str], model: Optional[str] = None) -> List[List[float]]:
+    def _embed_batch(self, texts: List[str], model: str) -> Optional[List[List[float]]]:
+        """Embed several texts in one /api/embed request; None if the server can't serve it"""
+        try:
+            response = requests.post(
+                f"{self.base_url}/api/embed",
+                json={"model": model, "input": texts},
+                timeout=self.timeout
+            )
+            if response.status_code == 200:
+                embeddings = response.json().get('embeddings', [])
+                if len(embeddings) == len(texts):
+                    return embeddings
+            print(f"⚠️ Batch embedding unavailable ({response.status_code}), embedding texts one by one")
+        except Exception as e:
+            print(f"⚠️ Batch embedding error: {e}, embedding texts one by one")
+        return None
+    
+    def generate_batch_embeddings(self, texts: List[str], model: Optional[str] = None,
+                                  batch_size: int = EMBEDDING_BATCH_SIZE) -> List[List[float]]:
         """
         Generate embeddings for multiple texts
         
         Args:
             texts: List of input texts
             model: Embedding model name (optional)
+            batch_size: Texts sent per embedding request
             
         Returns:
             List of embedding vectors
         """
-        embeddings = []
+        model = model or self.embedding_model
+        
+        if not model:
+            print("⚠️ No embedding model available")
+            return [[0.0] * 384 for _ in texts]
+        
+        # Serve cached texts first and only send the misses to the server
+        cache_keys = [("embed", model, hashlib.sha256(text.encode("utf-8")).hexdigest()) for text in texts]
+        embeddings = [self._embedding_cache.get(key) for key in cache_keys]
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
         
-        for i, text in enumerate(texts):
-            print(f"   📊 Generating embedding {i + 1}/{len(texts)}")
-            embedding = self.generate_embedding(text, model)
-            embeddings.append(embedding)
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start:start + batch_size]
+            print(f"   📊 Generating embeddings {start + 1}-{start + len(batch)}/{len(missing)}")
             
-            # Small delay to avoid overwhelming the server
-            time.sleep(0.1)
+            vectors = self._embed_batch([texts[i] for i in batch], model)
+            if vectors is None:
+                vectors = [self.generate_embedding(texts[i], model) for i in batch]
+            else:
+                for i, vector in zip(batch, vectors):
+                    self._embedding_cache[cache_keys[i]] = vector
+            
+            for i, vector in zip(batch, vectors):
+                embeddings[i] = vector
         
         return embeddings
     
@@ -353,56 +521,14 @@ class OllamaClient:
         Returns:
             Analysis result with intent, entities, etc.
         """
-        system_prompt = """You are an expert HR analytics specialist. Analyze queries about employee data comprehensively.
-
-QUERY TYPES:
-- count_query: "How many", "Count of", "Total number"
-- comparison: "Compare X vs Y", "Difference between", "X versus Y"
-- ranking: "Top 10", "Bottom 5", "Highest", "Lowest", "Best", "Worst"
-- correlation: "High X with low Y", "Employees who have X and Y", complex relationships
-- recommendation: "Who needs", "Suggest", "Should we", "Recommend"
-- trend_analysis: "Recent", "Last 6 months", "New joiners", "Over time"
-- complex_filter: Multiple criteria (department AND skills AND experience)
-- analytics: Average, mean, median, statistics
-- employee_search: Simple "Find" or "Show me"
-
-DATA FIELDS:
-- Personal: age, gender, location
-- Employment: department, role, work_mode, employment_type, joining_date
-- Skills: certifications, courses_completed, learning_hours_ytd
-- Experience: total_experience_years, years_in_current_company, known_skills_count
-- Performance: performance_rating, awards, kpis_met_pct
-- Engagement: current_project, engagement_score, manager_feedback
-- Compensation: current_salary, bonus, total_ctc
-- Attendance: leave_balance, leave_days_taken, monthly_attendance_pct
-- Attrition: attrition_risk_score, exit_intent_flag
-
-Return JSON with:
-{
-    "intent": "query_type",
-    "entities": {
-        "departments": ["IT", "Sales"],
-        "roles": ["Developer"],
-        "skills": ["AWS", "Python"],
-        "locations": ["Remote"],
-        "experience_range": {"min": 5, "max": 10},
-        "performance_range": {"min": 4, "max": 5},
-        "age_range": {"min": 25, "max": 35}
-    },
-    "fields_to_analyze": ["performance_rating", "current_salary"],
-    "comparison_groups": ["IT", "Sales"],
-    "filters": {
-        "department": "IT",
-        "experience_min": 5
-    },
-    "sorting": {
-        "field": "performance_rating",
-        "order": "desc"
-    },
-    "aggregation_type": "average|count|max|min|sum",
-    "limit": 10
-}"""
-
+        # Case and whitespace variants of a query share one entry
+        cache_key = " ".join(query.lower().split())
+        with self._intent_cache_lock:
+            cached = self._intent_cache.get(cache_key)
+        if cached is not None:
+            # Callers mutate the analysis, so never hand out the cached dict itself
+            return copy.deepcopy(cached)
+        
         user_prompt = f"""
         Analyze this HR query comprehensively: "{query}"
         
@@ -413,7 +539,7 @@ Return JSON with:
         try:
             response = self.generate_text(
                 prompt=user_prompt,
-                system_prompt=system_prompt,
+                system_prompt=INTENT_ANALYSIS_SYSTEM_PROMPT,
                 max_tokens=800,
                 temperature=0.1,
                 query_type="structured_queries",
@@ -423,6 +549,9 @@ Return JSON with:
             # Try to parse JSON response
             try:
                 analysis = json.loads(response)
+                # Only model analyses are cached; pattern-matching fallbacks are retried next time
+                with self._intent_cache_lock:
+                    self._intent_cache[cache_key] = copy.deepcopy(analysis)
                 return analysis
             except json.JSONDecodeError:
                 # Fallback to basic analysis
@@ -437,25 +566,16 @@ Return JSON with:
         query_lower = query.lower()
         
         # Basic intent detection
-        if any(word in query_lower for word in ["compare", "vs", "versus", "difference"]):
-            intent = "comparison"
-        elif any(word in query_lower for word in ["top", "bottom", "highest", "lowest", "best", "worst"]):
-            intent = "ranking"
-        elif any(word in query_lower for word in ["how many", "count", "total"]):
-            intent = "count_query"
-        elif any(word in query_lower for word in ["average", "mean", "statistics"]):
-            intent = "analytics"
-        else:
-            intent = "employee_search"
+        intent = next(
+            (intent for intent, pattern in _FALLBACK_INTENT_PATTERNS if pattern.search(query_lower)),
+            "employee_search"
+        )
         
         # Basic entity extraction
         entities = {}
-        departments = ["Sales", "IT", "Operations", "HR", "Finance", "Legal", "Engineering", "Marketing", "Support"]
-        for dept in departments:
-            if dept.lower() in query_lower:
-                if "departments" not in entities:
-                    entities["departments"] = []
-                entities["departments"].append(dept)
+        mentioned = set(_DEPARTMENT_PATTERN.findall(query_lower))
+        if mentioned:
+            entities["departments"] = [dept for dept in FALLBACK_DEPARTMENTS if dept.lower() in mentioned]
         
         return {
             "intent": intent,
@@ -485,34 +605,6 @@ Return JSON with:
         Returns:
             Natural language response
         """
-        system_prompt = """You are a senior HR analytics executive providing board-level insights and strategic recommendations.
-
-        CRITICAL: Generate responses in a professional, executive-ready format suitable for C-level presentations.
-
-        Response Structure (MANDATORY):
-        1. EXECUTIVE SUMMARY (2-3 sentences max)
-        2. KEY FINDINGS (bullet points with specific metrics)
-        3. DETAILED ANALYSIS (professional table format)
-        4. STRATEGIC IMPLICATIONS (business impact)
-        5. RECOMMENDED ACTIONS (numbered priority list)
-
-        Formatting Requirements:
-        - Use professional business language
-        - Include specific metrics and percentages
-        - Create clean, readable tables with proper alignment
-        - Use bullet points for clarity
-        - Avoid casual language or informal tone
-        - Focus on business value and ROI
-        - Include comparative analysis where relevant
-
-        Table Format Example:
-        | Rank | Employee | Department | Role | Rating | KPIs | Status |
-        |------|----------|------------|------|--------|------|--------|
-        | 1    | Name     | Dept       | Role  | 4.2    | 85%  | Top    |
-
-        Tone: Professional, data-driven, strategic, executive-level
-        """
-        
         # Build context
         context = {
             "query": query,
@@ -571,7 +663,7 @@ Return JSON with:
             
             response = self.generate_text(
                 prompt=user_prompt,
-                system_prompt=system_prompt,
+                system_prompt=RESPONSE_SYSTEM_PROMPT,
                 max_tokens=600,
                 temperature=0.3,
                 query_type="complex_analytics" if complexity == "high" else "structured_queries",
@@ -16,6 +16,7 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.query.ollama_query_engine import OllamaHRQueryEngine
 from src.search.local_search_client import LocalSearchClient
+from src.database.collections import employee_collections
 from src.ai.hr_analytics_agent import hr_analytics_agent
 
 # Initialize FastAPI app
@@ -80,6 +81,19 @@ class HealthResponse(BaseModel):
     message: str
     version: str
 
+# Static info/health payloads, built once at import
+API_INFO_RESPONSE = HealthResponse(
+    status="active",
+    message="HR Q&A System API is running",
+    version="1.0.0"
+)
+
+HEALTH_RESPONSE = HealthResponse(
+    status="healthy",
+    message="All systems operational",
+    version="1.0.0"
+)
+
 class SearchRequest(BaseModel):
     query: str
     filters: Optional[Dict[str, Any]] = None
@@ -99,23 +113,12 @@ async def root():
 @app.get("/api", response_model=HealthResponse)
 async def api_info():
     """API information endpoint"""
-    return HealthResponse(
-        status="active",
-        message="HR Q&A System API is running",
-        version="1.0.0"
-    )
+    return API_INFO_RESPONSE
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Health check endpoint"""
-    try:
-        return HealthResponse(
-            status="healthy",
-            message="All systems operational",
-            version="1.0.0"
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Health check failed: {str(e)}")
+    return HEALTH_RESPONSE
 
 @app.post("/api/query", response_model=QueryResponse)
 async def process_query(request: QueryRequest):
@@ -641,6 +644,9 @@ async def add_employee(employee_data: Dict[str, Any]):
         await search_client.mongodb_client.insert_documents("employee_engagement_info", [engagement_data])
         await search_client.mongodb_client.insert_documents("employee_attrition_info", [attrition_data])
         
+        # The search index no longer matches the workbook it was built from
+        await employee_collections.clear_search_index_fingerprint()
+        
         return {
             "message": "Employee added successfully",
             "employee_id": next_id,
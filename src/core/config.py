@@ -1,9 +1,31 @@
 # src/core/config.py - Ollama-based Configuration (No Azure Dependencies)
+import functools
 import os
+import sys
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Dict, List, Optional
+
+# Environment variables that must be set for the application to work
+REQUIRED_ENV_VARS = (
+    "MONGODB_CONNECTION_STRING",
+    "MONGODB_DATABASE"
+)
 
 def load_env_file():
-    """Load .env file with multiple path attempts"""
+    """Load .env file with multiple path attempts
+    
+    Does nothing when the required variables are already set in the
+    environment. Progress messages are collected and written to stdout
+    in one call; per-path and per-variable lines are only included when
+    HRQA_CONFIG_VERBOSE is set.
+    """
+    # Environment already provided (e.g. by Docker/Kubernetes); skip .env parsing
+    if all(os.environ.get(var) for var in REQUIRED_ENV_VARS):
+        return True
+    
+    verbose = bool(os.getenv("HRQA_CONFIG_VERBOSE"))
+    log = []
     
     # Define possible .env file locations
     possible_paths = [
@@ -19,14 +41,15 @@ def load_env_file():
         Path.cwd() / ".env"
     ]
     
-    print("🔍 Searching for .env file...")
+    log.append("🔍 Searching for .env file...")
     
     for env_path in possible_paths:
         env_path = Path(env_path).resolve()
-        print(f"   Checking: {env_path}")
+        if verbose:
+            log.append(f"   Checking: {env_path}")
         
         if env_path.exists():
-            print(f"✅ Found .env file at: {env_path}")
+            log.append(f"✅ Found .env file at: {env_path}")
             try:
                 with open(env_path, 'r') as f:
                     for line_num, line in enumerate(f, 1):
@@ -37,90 +60,129 @@ def load_env_file():
                                 key = key.strip()
                                 value = value.strip().strip('"').strip("'")
                                 os.environ[key] = value
-                                print(f"   ✅ Loaded: {key}")
+                                if verbose:
+                                    log.append(f"   ✅ Loaded: {key}")
                             except ValueError:
-                                print(f"   ⚠️ Skipped invalid line {line_num}: {line}")
+                                log.append(f"   ⚠️ Skipped invalid line {line_num}: {line}")
                 
-                print(f"✅ Successfully loaded .env from: {env_path}")
+                log.append(f"✅ Successfully loaded .env from: {env_path}")
+                _write_log(log)
                 return True
                 
-            except Exception as e:
-                print(f"❌ Error reading .env file: {e}")
+            except (OSError, UnicodeDecodeError) as e:
+                log.append(f"❌ Error reading .env file: {e}")
                 continue
     
-    print("❌ .env file not found in any expected location")
-    print("📍 Current working directory:", Path.cwd())
-    print("📍 Script location:", Path(__file__).parent)
+    log.append("❌ .env file not found in any expected location")
+    log.append(f"📍 Current working directory: {Path.cwd()}")
+    log.append(f"📍 Script location: {Path(__file__).parent}")
     
     # List files in current directory for debugging
-    print("\n📂 Files in current directory:")
+    log.append("\n📂 Files in current directory:")
     try:
         for item in Path.cwd().iterdir():
             if item.name.startswith('.env'):
-                print(f"   Found: {item.name}")
-    except:
+                log.append(f"   Found: {item.name}")
+    except OSError:
         pass
     
+    _write_log(log)
     return False
 
+def _write_log(lines: List[str]):
+    """Write buffered log lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
 # Load environment variables
 env_loaded = load_env_file()
 
+@dataclass(slots=True)
 class Settings:
-    def __init__(self):
-        # Check if required environment variables are loaded (Ollama-based)
-        required_vars = [
-            "MONGODB_CONNECTION_STRING",
-            "MONGODB_DATABASE"
-        ]
+    """Application settings resolved once from a snapshot of the environment"""
+    
+    # MongoDB Configuration
+    mongodb_connection_string: Optional[str] = field(default=None, repr=False)
+    mongodb_database: str = "hr_qna_poc"
+    
+    # Ollama Configuration
+    ollama_base_url: str = "http://localhost:11434"
+    ollama_embedding_model: str = "nomic-embed-text:v1.5"
+    
+    # Azure Search Configuration (optional; only the ETL's search index step uses it)
+    azure_search_endpoint: Optional[str] = None
+    azure_search_api_key: Optional[str] = field(default=None, repr=False)
+    
+    # Application Configuration
+    log_level: str = "INFO"
+    environment: str = "development"
+    max_concurrent_requests: int = 10
+    embedding_cache_ttl: int = 3600
+    
+    # Server Configuration
+    host: str = "0.0.0.0"
+    port: int = 8000
+    debug: bool = True
+    
+    # Security Configuration
+    secret_key: str = field(default="your-secret-key-here", repr=False)
+    allowed_hosts: List[str] = field(default_factory=lambda: ["localhost", "127.0.0.1"])
+    
+    # Performance Configuration
+    max_workers: int = 4
+    timeout: int = 30
+    
+    @classmethod
+    def from_env(cls, env: Optional[Dict[str, str]] = None) -> "Settings":
+        """Build settings from a single dict snapshot of os.environ"""
+        env = dict(os.environ) if env is None else env
         
-        missing_vars = []
-        for var in required_vars:
-            if not os.getenv(var):
-                missing_vars.append(var)
+        # Check if required environment variables are loaded (Ollama-based)
+        missing_vars = [var for var in REQUIRED_ENV_VARS if not env.get(var)]
         
         if missing_vars:
             print(f"❌ Missing required environment variables: {missing_vars}")
             print("💡 Make sure your .env file contains these variables")
         
-        # MongoDB Configuration
-        self.mongodb_connection_string = os.getenv("MONGODB_CONNECTION_STRING")
-        self.mongodb_database = os.getenv("MONGODB_DATABASE", "hr_qna_poc")
-        
-        # Ollama Configuration
-        self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        self.ollama_embedding_model = os.getenv("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text:v1.5")
-        
-        # Application Configuration
-        self.log_level = os.getenv("LOG_LEVEL", "INFO")
-        self.environment = os.getenv("ENVIRONMENT", "development")
-        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
-        self.embedding_cache_ttl = int(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
-        
-        # Server Configuration
-        self.host = os.getenv("HOST", "0.0.0.0")
-        self.port = int(os.getenv("PORT", "8000"))
-        self.debug = os.getenv("DEBUG", "true").lower() == "true"
-        
-        # Security Configuration
-        self.secret_key = os.getenv("SECRET_KEY", "your-secret-key-here")
-        self.allowed_hosts = os.getenv("ALLOWED_HOSTS", "localhost,127.0.0.1").split(",")
-        
-        # Performance Configuration
-        self.max_workers = int(os.getenv("MAX_WORKERS", "4"))
-        self.timeout = int(os.getenv("TIMEOUT", "30"))
+        config = cls(
+            mongodb_connection_string=env.get("MONGODB_CONNECTION_STRING"),
+            mongodb_database=env.get("MONGODB_DATABASE", "hr_qna_poc"),
+            ollama_base_url=env.get("OLLAMA_BASE_URL", "http://localhost:11434"),
+            ollama_embedding_model=env.get("OLLAMA_EMBEDDING_MODEL", "nomic-embed-text:v1.5"),
+            azure_search_endpoint=env.get("AZURE_SEARCH_ENDPOINT"),
+            azure_search_api_key=env.get("AZURE_SEARCH_API_KEY"),
+            log_level=env.get("LOG_LEVEL", "INFO"),
+            environment=env.get("ENVIRONMENT", "development"),
+            max_concurrent_requests=int(env.get("MAX_CONCURRENT_REQUESTS", "10")),
+            embedding_cache_ttl=int(env.get("EMBEDDING_CACHE_TTL", "3600")),
+            host=env.get("HOST", "0.0.0.0"),
+            port=int(env.get("PORT", "8000")),
+            debug=env.get("DEBUG", "true").lower() == "true",
+            secret_key=env.get("SECRET_KEY", "your-secret-key-here"),
+            allowed_hosts=env.get("ALLOWED_HOSTS", "localhost,127.0.0.1").split(","),
+            max_workers=int(env.get("MAX_WORKERS", "4")),
+            timeout=int(env.get("TIMEOUT", "30"))
+        )
         
         # Print loaded configuration (without sensitive data)
-        print("\n⚙️ Configuration Status:")
-        print(f"   MongoDB Database: {self.mongodb_database}")
-        print(f"   MongoDB Connection: {'✅ Set' if self.mongodb_connection_string else '❌ Missing'}")
-        print(f"   Ollama Base URL: {self.ollama_base_url}")
-        print(f"   Ollama Embedding Model: {self.ollama_embedding_model}")
-        print(f"   Environment: {self.environment}")
-        print(f"   Debug Mode: {self.debug}")
-        print(f"   Server: {self.host}:{self.port}")
+        _write_log([
+            "\n⚙️ Configuration Status:",
+            f"   MongoDB Database: {config.mongodb_database}",
+            f"   MongoDB Connection: {'✅ Set' if config.mongodb_connection_string else '❌ Missing'}",
+            f"   Ollama Base URL: {config.ollama_base_url}",
+            f"   Ollama Embedding Model: {config.ollama_embedding_model}",
+            f"   Environment: {config.environment}",
+            f"   Debug Mode: {config.debug}",
+            f"   Server: {config.host}:{config.port}"
+        ])
+        
+        return config
+
+@functools.lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, built from the environment on first use"""
+    return Settings.from_env()
 
-settings = Settings()
+settings = get_settings()
 
 if __name__ == "__main__":
     print("✅ Configuration loaded successfully")
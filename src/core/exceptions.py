@@ -4,23 +4,86 @@ Custom exception classes for the HR Q&A system.
 Provides specific error types for better error handling and debugging.
 """
 
+import functools
+import re
+import types
+
+# Error codes reported in HRQAException.error_code
+HRQA_ERROR = "HRQA_ERROR"
+DB_ERROR = "DB_ERROR"
+DB_CONNECTION_ERROR = "DB_CONNECTION_ERROR"
+DOC_NOT_FOUND = "DOC_NOT_FOUND"
+DOC_INSERT_ERROR = "DOC_INSERT_ERROR"
+DOC_UPDATE_ERROR = "DOC_UPDATE_ERROR"
+DOC_DELETE_ERROR = "DOC_DELETE_ERROR"
+SEARCH_ERROR = "SEARCH_ERROR"
+SEARCH_SERVICE_ERROR = "SEARCH_SERVICE_ERROR"
+SEARCH_INDEX_ERROR = "SEARCH_INDEX_ERROR"
+EMBEDDING_ERROR = "EMBEDDING_ERROR"
+VECTOR_SEARCH_ERROR = "VECTOR_SEARCH_ERROR"
+QUERY_ERROR = "QUERY_ERROR"
+INTENT_DETECTION_ERROR = "INTENT_DETECTION_ERROR"
+ENTITY_EXTRACTION_ERROR = "ENTITY_EXTRACTION_ERROR"
+RESPONSE_GENERATION_ERROR = "RESPONSE_GENERATION_ERROR"
+API_ERROR = "API_ERROR"
+VALIDATION_ERROR = "VALIDATION_ERROR"
+AUTH_ERROR = "AUTH_ERROR"
+AUTHZ_ERROR = "AUTHZ_ERROR"
+RATE_LIMIT_ERROR = "RATE_LIMIT_ERROR"
+CONFIG_ERROR = "CONFIG_ERROR"
+MISSING_CONFIG = "MISSING_CONFIG"
+INVALID_CONFIG = "INVALID_CONFIG"
+PROCESSING_ERROR = "PROCESSING_ERROR"
+ETL_ERROR = "ETL_ERROR"
+DATA_VALIDATION_ERROR = "DATA_VALIDATION_ERROR"
+FILE_PROCESSING_ERROR = "FILE_PROCESSING_ERROR"
+
 class HRQAException(Exception):
     """Base exception class for HR Q&A system"""
     
+    # Class name reported by to_dict(), cached per class at definition time
+    _error_name = "HRQAException"
+    
+    # Leaf classes that never add to details after construction set this to expose it read-only
+    _immutable_details = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._error_name = cls.__name__
+    
     def __init__(self, message: str, error_code: str = None, details: dict = None):
         self.message = message
-        self.error_code = error_code or "HRQA_ERROR"
+        self.error_code = error_code or HRQA_ERROR
         self.details = details or {}
+        if self._immutable_details:
+            self.details = types.MappingProxyType(self.details)
         super().__init__(self.message)
     
     def to_dict(self):
         """Convert exception to dictionary"""
         return {
-            "error": self.__class__.__name__,
+            "error": self._error_name,
             "message": self.message,
             "error_code": self.error_code,
-            "details": self.details
+            "details": dict(self.details) if self._immutable_details else self.details
         }
+    
+    def __reduce__(self):
+        """Pickle and copy from instance state; a mappingproxy cannot be pickled, and
+        subclass constructors do not take the (message,) args BaseException would replay"""
+        state = dict(self.__dict__)
+        if self._immutable_details:
+            state["details"] = dict(self.details)
+        return _restore_exception, (type(self), self.args, state)
+
+def _restore_exception(cls, args: tuple, state: dict):
+    """Rebuild an HRQAException from __reduce__ output without calling its __init__"""
+    exc = cls.__new__(cls, *args)
+    exc.args = args
+    if cls._immutable_details:
+        state["details"] = types.MappingProxyType(state["details"])
+    exc.__dict__.update(state)
+    return exc
 
 # Database Exceptions
 class DatabaseException(HRQAException):
@@ -34,14 +97,24 @@ class DatabaseException(HRQAException):
             details["operation"] = operation
         if collection:
             details["collection"] = collection
-        super().__init__(message, "DB_ERROR", details)
+        super().__init__(message, DB_ERROR, details)
+    
+    def _init_from_template(self, message: str, error_code: str):
+        """Initialise from the subclass's static _BASE_DETAILS instead of the branching constructor"""
+        details = dict(self._BASE_DETAILS)
+        self.operation = details.get("operation")
+        self.collection = details.get("collection")
+        HRQAException.__init__(self, message, error_code, details)
 
 class DatabaseConnectionException(DatabaseException):
     """Exception for database connection failures"""
     
+    _immutable_details = True
+    
+    _BASE_DETAILS = {"operation": "connection"}
+    
     def __init__(self, message: str = "Failed to connect to database"):
-        super().__init__(message, "connection", None)
-        self.error_code = "DB_CONNECTION_ERROR"
+        self._init_from_template(message, DB_CONNECTION_ERROR)
 
 class DocumentNotFoundException(DatabaseException):
     """Exception for when a document is not found"""
@@ -49,18 +122,20 @@ class DocumentNotFoundException(DatabaseException):
     def __init__(self, collection: str, filter_criteria: dict):
         message = f"Document not found in collection '{collection}'"
         super().__init__(message, "find", collection)
-        self.error_code = "DOC_NOT_FOUND"
+        self.error_code = DOC_NOT_FOUND
         self.details["filter"] = filter_criteria
 
 class DocumentInsertException(DatabaseException):
     """Exception for document insertion failures"""
     
+    _immutable_details = True
+    
     def __init__(self, collection: str, error_details: str = None):
         message = f"Failed to insert document in collection '{collection}'"
         if error_details:
             message += f": {error_details}"
         super().__init__(message, "insert", collection)
-        self.error_code = "DOC_INSERT_ERROR"
+        self.error_code = DOC_INSERT_ERROR
 
 class DocumentUpdateException(DatabaseException):
     """Exception for document update failures"""
@@ -70,7 +145,7 @@ class DocumentUpdateException(DatabaseException):
         if error_details:
             message += f": {error_details}"
         super().__init__(message, "update", collection)
-        self.error_code = "DOC_UPDATE_ERROR"
+        self.error_code = DOC_UPDATE_ERROR
         self.details["document_id"] = document_id
 
 class DocumentDeleteException(DatabaseException):
@@ -81,7 +156,7 @@ class DocumentDeleteException(DatabaseException):
         if error_details:
             message += f": {error_details}"
         super().__init__(message, "delete", collection)
-        self.error_code = "DOC_DELETE_ERROR"
+        self.error_code = DOC_DELETE_ERROR
         self.details["document_id"] = document_id
 
 # Search Exceptions
@@ -96,23 +171,32 @@ class SearchException(HRQAException):
             details["search_type"] = search_type
         if query:
             details["query"] = query
-        super().__init__(message, "SEARCH_ERROR", details)
+        super().__init__(message, SEARCH_ERROR, details)
+    
+    def _init_from_template(self, message: str, error_code: str):
+        """Initialise from the subclass's static _BASE_DETAILS instead of the branching constructor"""
+        details = dict(self._BASE_DETAILS)
+        self.search_type = details.get("search_type")
+        self.query = details.get("query")
+        HRQAException.__init__(self, message, error_code, details)
 
 class SearchServiceException(SearchException):
     """Exception for Azure Search service errors"""
     
+    _BASE_DETAILS = {"search_type": "azure_search"}
+    
     def __init__(self, message: str, service_error: str = None):
-        super().__init__(message, "azure_search", None)
-        self.error_code = "SEARCH_SERVICE_ERROR"
+        self._init_from_template(message, SEARCH_SERVICE_ERROR)
         if service_error:
             self.details["service_error"] = service_error
 
 class SearchIndexException(SearchException):
     """Exception for search index related errors"""
     
+    _BASE_DETAILS = {"search_type": "index_operation"}
+    
     def __init__(self, message: str, index_name: str, operation: str = None):
-        super().__init__(message, "index_operation", None)
-        self.error_code = "SEARCH_INDEX_ERROR"
+        self._init_from_template(message, SEARCH_INDEX_ERROR)
         self.details["index_name"] = index_name
         if operation:
             self.details["operation"] = operation
@@ -120,18 +204,20 @@ class SearchIndexException(SearchException):
 class EmbeddingException(SearchException):
     """Exception for embedding generation errors"""
     
+    _BASE_DETAILS = {"search_type": "embedding"}
+    
     def __init__(self, message: str, text: str = None):
-        super().__init__(message, "embedding", None)
-        self.error_code = "EMBEDDING_ERROR"
+        self._init_from_template(message, EMBEDDING_ERROR)
         if text:
             self.details["text_length"] = len(text)
 
 class VectorSearchException(SearchException):
     """Exception for vector search errors"""
     
+    _BASE_DETAILS = {"search_type": "vector_search"}
+    
     def __init__(self, message: str, vector_dimension: int = None):
-        super().__init__(message, "vector_search", None)
-        self.error_code = "VECTOR_SEARCH_ERROR"
+        self._init_from_template(message, VECTOR_SEARCH_ERROR)
         if vector_dimension:
             self.details["vector_dimension"] = vector_dimension
 
@@ -147,21 +233,23 @@ class QueryException(HRQAException):
             details["query"] = query
         if intent:
             details["intent"] = intent
-        super().__init__(message, "QUERY_ERROR", details)
+        super().__init__(message, QUERY_ERROR, details)
 
 class IntentDetectionException(QueryException):
     """Exception for intent detection failures"""
     
+    _immutable_details = True
+    
     def __init__(self, message: str, query: str):
         super().__init__(message, query, None)
-        self.error_code = "INTENT_DETECTION_ERROR"
+        self.error_code = INTENT_DETECTION_ERROR
 
 class EntityExtractionException(QueryException):
     """Exception for entity extraction failures"""
     
     def __init__(self, message: str, query: str, entities: dict = None):
         super().__init__(message, query, None)
-        self.error_code = "ENTITY_EXTRACTION_ERROR"
+        self.error_code = ENTITY_EXTRACTION_ERROR
         if entities:
             self.details["extracted_entities"] = entities
 
@@ -170,7 +258,7 @@ class ResponseGenerationException(QueryException):
     
     def __init__(self, message: str, query: str, context: str = None):
         super().__init__(message, query, None)
-        self.error_code = "RESPONSE_GENERATION_ERROR"
+        self.error_code = RESPONSE_GENERATION_ERROR
         if context:
             self.details["context_length"] = len(context)
 
@@ -184,14 +272,22 @@ class APIException(HRQAException):
         details = {"status_code": status_code}
         if endpoint:
             details["endpoint"] = endpoint
-        super().__init__(message, "API_ERROR", details)
+        super().__init__(message, API_ERROR, details)
+    
+    def _init_from_template(self, message: str, error_code: str):
+        """Initialise from the subclass's static _BASE_DETAILS instead of the branching constructor"""
+        details = dict(self._BASE_DETAILS)
+        self.status_code = details["status_code"]
+        self.endpoint = details.get("endpoint")
+        HRQAException.__init__(self, message, error_code, details)
 
 class ValidationException(APIException):
     """Exception for request validation errors"""
     
+    _BASE_DETAILS = {"status_code": 400}
+    
     def __init__(self, message: str, field: str = None, value: str = None):
-        super().__init__(message, 400, None)
-        self.error_code = "VALIDATION_ERROR"
+        self._init_from_template(message, VALIDATION_ERROR)
         if field:
             self.details["field"] = field
         if value:
@@ -200,25 +296,30 @@ class ValidationException(APIException):
 class AuthenticationException(APIException):
     """Exception for authentication errors"""
     
+    _immutable_details = True
+    
+    _BASE_DETAILS = {"status_code": 401}
+    
     def __init__(self, message: str = "Authentication failed"):
-        super().__init__(message, 401, None)
-        self.error_code = "AUTH_ERROR"
+        self._init_from_template(message, AUTH_ERROR)
 
 class AuthorizationException(APIException):
     """Exception for authorization errors"""
     
+    _BASE_DETAILS = {"status_code": 403}
+    
     def __init__(self, message: str = "Access denied", resource: str = None):
-        super().__init__(message, 403, None)
-        self.error_code = "AUTHZ_ERROR"
+        self._init_from_template(message, AUTHZ_ERROR)
         if resource:
             self.details["resource"] = resource
 
 class RateLimitException(APIException):
     """Exception for rate limiting errors"""
     
+    _BASE_DETAILS = {"status_code": 429}
+    
     def __init__(self, message: str = "Rate limit exceeded", retry_after: int = None):
-        super().__init__(message, 429, None)
-        self.error_code = "RATE_LIMIT_ERROR"
+        self._init_from_template(message, RATE_LIMIT_ERROR)
         if retry_after:
             self.details["retry_after_seconds"] = retry_after
 
@@ -231,15 +332,17 @@ class ConfigurationException(HRQAException):
         details = {}
         if config_key:
             details["config_key"] = config_key
-        super().__init__(message, "CONFIG_ERROR", details)
+        super().__init__(message, CONFIG_ERROR, details)
 
 class MissingConfigException(ConfigurationException):
     """Exception for missing configuration values"""
     
+    _immutable_details = True
+    
     def __init__(self, config_key: str):
         message = f"Missing required configuration: {config_key}"
         super().__init__(message, config_key)
-        self.error_code = "MISSING_CONFIG"
+        self.error_code = MISSING_CONFIG
 
 class InvalidConfigException(ConfigurationException):
     """Exception for invalid configuration values"""
@@ -249,7 +352,7 @@ class InvalidConfigException(ConfigurationException):
         if expected:
             message += f" (expected: {expected})"
         super().__init__(message, config_key)
-        self.error_code = "INVALID_CONFIG"
+        self.error_code = INVALID_CONFIG
         self.details["value"] = value
         if expected:
             self.details["expected"] = expected
@@ -266,14 +369,14 @@ class ProcessingException(HRQAException):
             details["process_type"] = process_type
         if file_path:
             details["file_path"] = file_path
-        super().__init__(message, "PROCESSING_ERROR", details)
+        super().__init__(message, PROCESSING_ERROR, details)
 
 class ETLException(ProcessingException):
     """Exception for ETL process errors"""
     
     def __init__(self, message: str, stage: str, source: str = None):
         super().__init__(message, "etl", source)
-        self.error_code = "ETL_ERROR"
+        self.error_code = ETL_ERROR
         self.details["stage"] = stage
 
 class DataValidationException(ProcessingException):
@@ -281,7 +384,7 @@ class DataValidationException(ProcessingException):
     
     def __init__(self, message: str, field: str = None, value: str = None, rule: str = None):
         super().__init__(message, "validation", None)
-        self.error_code = "DATA_VALIDATION_ERROR"
+        self.error_code = DATA_VALIDATION_ERROR
         if field:
             self.details["field"] = field
         if value:
@@ -294,46 +397,84 @@ class FileProcessingException(ProcessingException):
     
     def __init__(self, message: str, file_path: str, file_type: str = None):
         super().__init__(message, "file_processing", file_path)
-        self.error_code = "FILE_PROCESSING_ERROR"
+        self.error_code = FILE_PROCESSING_ERROR
         if file_type:
             self.details["file_type"] = file_type
 
 # Utility functions for exception handling
+def _translate_error(error: Exception, error_map: dict, default):
+    """Build the HRQA exception for an error from the first class in its MRO found in error_map"""
+    for cls in type(error).__mro__:
+        factory = error_map.get(cls)
+        if factory is not None:
+            return factory(error)
+    return default(str(error))
+
+# Driver/builtin exception classes mapped to HRQA exception factories. Only real connection and
+# driver errors are listed; a stray KeyError or IndexError is a bug, not a missing document
+_DATABASE_ERROR_MAP = {
+    ConnectionError: lambda e: DatabaseConnectionException(str(e)),
+}
+_database_driver_errors_loaded = False
+
+def _database_error_map() -> dict:
+    """Return _DATABASE_ERROR_MAP, adding the pymongo error classes on first use"""
+    global _database_driver_errors_loaded
+    if not _database_driver_errors_loaded:
+        _database_driver_errors_loaded = True
+        try:
+            from pymongo.errors import ConnectionFailure, OperationFailure
+        except ImportError:
+            pass
+        else:
+            _DATABASE_ERROR_MAP[ConnectionFailure] = lambda e: DatabaseConnectionException(str(e))
+            _DATABASE_ERROR_MAP[OperationFailure] = lambda e: DatabaseException(str(e))
+    return _DATABASE_ERROR_MAP
+
 def handle_database_error(func):
     """Decorator to handle database errors"""
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
+        except DatabaseException:
+            # Already specific, e.g. a DocumentNotFoundException raised by the function itself
+            raise
         except Exception as e:
-            if "connection" in str(e).lower():
-                raise DatabaseConnectionException(str(e))
-            elif "not found" in str(e).lower():
-                raise DocumentNotFoundException("unknown", {})
-            else:
-                raise DatabaseException(str(e))
+            raise _translate_error(e, _database_error_map(), DatabaseException) from e
     return wrapper
 
+# Classifies search error messages in one case-insensitive pass; the lookaheads keep
+# "index" taking priority over "embedding" wherever each appears in the message
+_SEARCH_ERROR_PATTERN = re.compile(r"(?=.*?(?P<index>index))|(?=.*?(?P<embedding>embedding))", re.IGNORECASE | re.DOTALL)
+
 def handle_search_error(func):
     """Decorator to handle search errors"""
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            if "index" in str(e).lower():
-                raise SearchIndexException(str(e), "unknown")
-            elif "embedding" in str(e).lower():
-                raise EmbeddingException(str(e))
+            # Search backends raise untyped errors, so classify by message
+            message = str(e)
+            match = _SEARCH_ERROR_PATTERN.match(message)
+            kind = match.lastgroup if match else None
+            if kind == "index":
+                raise SearchIndexException(message, "unknown") from e
+            elif kind == "embedding":
+                raise EmbeddingException(message) from e
             else:
-                raise SearchException(str(e))
+                raise SearchException(message) from e
     return wrapper
 
 def handle_api_error(func):
     """Decorator to handle API errors"""
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
         except ValidationException:
             raise
         except Exception as e:
-            raise APIException(str(e))
-    return wrapper
\ No newline at end of file
+            raise APIException(str(e)) from e
+    return wrapper
@@ -1,18 +1,68 @@
 # src/core/models.py
-from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
-from enum import Enum
-
-class QueryType(Enum):
-    """Types of queries the system can handle"""
-    EMPLOYEE_SEARCH = "employee_search"
-    SKILL_SEARCH = "skill_search"
-    DEPARTMENT_INFO = "department_info"
-    GENERAL_INFO = "general_info"
-    COUNT_QUERY = "count_query"
-    COMPARISON = "comparison"
-    UNKNOWN = "unknown"
+from pydantic import AwareDatetime, BaseModel, ConfigDict, Field, field_validator, model_validator
+from typing import Optional, List, Dict, Any, Final, Sequence
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+import time
+
+# [epoch seconds, datetime] of the last timestamp handed out by _now()
+_LAST_NOW = [0.0, None]
+
+def _now() -> datetime:
+    """Current UTC time, reused for calls within the same millisecond"""
+    t = time.time()
+    # abs() so a backwards clock step (e.g. an NTP correction) refreshes too
+    if abs(t - _LAST_NOW[0]) > 0.001:
+        _LAST_NOW[:] = [t, datetime.fromtimestamp(t, timezone.utc)]
+    return _LAST_NOW[1]
+
+# Non-ISO date formats found in older source sheets, tried after ISO 8601
+LEGACY_DATE_FORMATS: Final[tuple] = ("%d/%m/%Y", "%d-%m-%Y", "%d-%b-%Y", "%d %b %Y", "%Y/%m/%d")
+
+def _parse_legacy_date(cls, value: Any) -> Any:
+    """Before-validator for employee date fields that used to accept any string.
+    
+    ISO strings and datetimes pass straight through to pydantic; blank strings become
+    None and the legacy formats are parsed here. Anything else still fails validation.
+    """
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for date_format in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return value
+
+# Types of queries the system can handle
+EMPLOYEE_SEARCH: Final[str] = "employee_search"
+SKILL_SEARCH: Final[str] = "skill_search"
+DEPARTMENT_INFO: Final[str] = "department_info"
+GENERAL_INFO: Final[str] = "general_info"
+COUNT_QUERY: Final[str] = "count_query"
+COMPARISON: Final[str] = "comparison"
+UNKNOWN: Final[str] = "unknown"
+
+VALID_QUERY_TYPES: Final[frozenset] = frozenset({
+    EMPLOYEE_SEARCH, SKILL_SEARCH, DEPARTMENT_INFO, GENERAL_INFO, COUNT_QUERY, COMPARISON, UNKNOWN,
+})
+
+class QueryType:
+    """Namespace for the query type constants, kept for QueryType.X call sites"""
+    EMPLOYEE_SEARCH = EMPLOYEE_SEARCH
+    SKILL_SEARCH = SKILL_SEARCH
+    DEPARTMENT_INFO = DEPARTMENT_INFO
+    GENERAL_INFO = GENERAL_INFO
+    COUNT_QUERY = COUNT_QUERY
+    COMPARISON = COMPARISON
+    UNKNOWN = UNKNOWN
 
 class EmployeePersonalInfo(BaseModel):
     """Employee personal information model"""
@@ -38,10 +88,12 @@ class EmployeeEmploymentInfo(BaseModel):
     grade_band: Optional[str] = None
     employment_type: Optional[str] = None
     manager_id: Optional[str] = None
-    joining_date: Optional[Union[str, datetime]] = None
+    joining_date: Optional[datetime] = None
     work_mode: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    _parse_dates = field_validator("joining_date", mode="before")(_parse_legacy_date)
 
 class EmployeeLearningInfo(BaseModel):
     """Employee learning and certification model"""
@@ -72,9 +124,11 @@ class EmployeePerformanceInfo(BaseModel):
     promotions_count: Optional[int] = None
     awards: Optional[str] = None
     improvement_areas: Optional[str] = None
-    last_review_date: Optional[Union[str, datetime]] = None
+    last_review_date: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    _parse_dates = field_validator("last_review_date", mode="before")(_parse_legacy_date)
 
 class EmployeeEngagementInfo(BaseModel):
     """Employee engagement information model"""
@@ -96,9 +150,11 @@ class EmployeeCompensationInfo(BaseModel):
     bonus: Optional[int] = None
     total_ctc: Optional[int] = None
     currency: Optional[str] = None
-    last_appraisal_date: Optional[Union[str, datetime]] = None
+    last_appraisal_date: Optional[datetime] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    _parse_dates = field_validator("last_appraisal_date", mode="before")(_parse_legacy_date)
 
 class EmployeeAttendanceInfo(BaseModel):
     """Employee attendance information model"""
@@ -125,82 +181,99 @@ class ProjectHistory(BaseModel):
     """Project history model"""
     employee_id: str
     project_name: Optional[str] = None
-    project_start_date: Optional[Union[str, datetime]] = None
-    project_end_date: Optional[Union[str, datetime]] = None
+    project_start_date: Optional[datetime] = None
+    project_end_date: Optional[datetime] = None
     project_success: Optional[str] = None
     client_feedback: Optional[str] = None
     contribution_level: Optional[str] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    
+    _parse_dates = field_validator("project_start_date", "project_end_date", mode="before")(_parse_legacy_date)
+
+# Profile section attribute -> model holding that section's fields
+_PROFILE_SECTIONS = {
+    "personal": EmployeePersonalInfo,
+    "employment": EmployeeEmploymentInfo,
+    "learning": EmployeeLearningInfo,
+    "experience": EmployeeExperienceInfo,
+    "performance": EmployeePerformanceInfo,
+    "engagement": EmployeeEngagementInfo,
+    "compensation": EmployeeCompensationInfo,
+    "attendance": EmployeeAttendanceInfo,
+    "attrition": EmployeeAttritionInfo,
+}
+
+# Flat field name -> profile section, so profile.department reads profile.employment.department
+_PROFILE_FIELD_SECTIONS = {
+    field_name: section
+    for section, model in _PROFILE_SECTIONS.items()
+    for field_name in model.model_fields
+    if field_name not in ("employee_id", "created_at", "updated_at")
+}
 
 class CompleteEmployeeProfile(BaseModel):
     """Complete employee profile combining all information"""
     employee_id: str
     
-    # Personal Info
-    full_name: Optional[str] = None
-    email: Optional[str] = None
-    age: Optional[int] = None
-    gender: Optional[str] = None
-    location: Optional[str] = None
-    contact_number: Optional[str] = None
-    address: Optional[str] = None
-    
-    # Employment Info
-    department: Optional[str] = None
-    role: Optional[str] = None
-    grade_band: Optional[str] = None
-    employment_type: Optional[str] = None
-    manager_id: Optional[str] = None
-    joining_date: Optional[Union[str, datetime]] = None
-    work_mode: Optional[str] = None
+    personal: Optional[EmployeePersonalInfo] = None
+    employment: Optional[EmployeeEmploymentInfo] = None
+    learning: Optional[EmployeeLearningInfo] = None
+    experience: Optional[EmployeeExperienceInfo] = None
+    performance: Optional[EmployeePerformanceInfo] = None
+    engagement: Optional[EmployeeEngagementInfo] = None
+    compensation: Optional[EmployeeCompensationInfo] = None  # sensitive
+    attendance: Optional[EmployeeAttendanceInfo] = None
+    attrition: Optional[EmployeeAttritionInfo] = None
     
-    # Learning Info
-    certifications: Optional[str] = None
-    courses_completed: Optional[int] = None
-    learning_hours_ytd: Optional[int] = None
-    internal_trainings: Optional[int] = None
-    
-    # Experience Info
-    total_experience_years: Optional[float] = None
-    years_in_current_company: Optional[float] = None
-    known_skills_count: Optional[int] = None
-    
-    # Performance Info
-    performance_rating: Optional[int] = None
-    awards: Optional[str] = None
-    improvement_areas: Optional[str] = None
-    
-    # Engagement Info
-    current_project: Optional[str] = None
-    engagement_score: Optional[int] = None
-    manager_feedback: Optional[str] = None
-    
-    # Compensation Info (sensitive)
-    current_salary: Optional[int] = None
-    total_ctc: Optional[int] = None
-    
-    # Attendance Info
-    monthly_attendance_pct: Optional[str] = None
-    leave_balance: Optional[int] = None
+    # Project History
+    project_history: List[ProjectHistory] = Field(default_factory=list)
     
-    # Attrition Info
-    attrition_risk_score: Optional[str] = None
-    exit_intent_flag: Optional[str] = None
+    @model_validator(mode="before")
+    @classmethod
+    def _fold_flat_fields(cls, data: Any) -> Any:
+        """Accept the flat shape get_complete_employee_profile returns by moving each
+        section field (e.g. department) into its section (employment)"""
+        if not isinstance(data, dict) or not any(name in _PROFILE_FIELD_SECTIONS for name in data):
+            return data
+        data = dict(data)
+        sections: Dict[str, Dict[str, Any]] = {}
+        for name in [name for name in data if name in _PROFILE_FIELD_SECTIONS]:
+            section = _PROFILE_FIELD_SECTIONS[name]
+            if section not in sections:
+                existing = data.get(section)
+                if isinstance(existing, BaseModel):
+                    existing = existing.model_dump(exclude_unset=True)
+                sections[section] = {"employee_id": data.get("employee_id"), **(existing or {})}
+            # A value given inside the section wins over the flat one
+            sections[section].setdefault(name, data.pop(name))
+        data.update(sections)
+        return data
     
-    # Project History
-    project_history: Optional[List[ProjectHistory]] = []
+    def __getattr__(self, name: str):
+        section = _PROFILE_FIELD_SECTIONS.get(name)
+        if section is None:
+            return super().__getattr__(name)
+        info = getattr(self, section)
+        return getattr(info, name) if info is not None else None
 
-class QueryEntities(BaseModel):
+@dataclass(slots=True, frozen=True)
+class QueryEntities:
     """Entities extracted from a query"""
     employee_name: Optional[str] = None
-    skills: List[str] = []
+    skills: Sequence[str] = ()
     department: Optional[str] = None
     location: Optional[str] = None
     position: Optional[str] = None
     
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert entities to dictionary"""
+        return asdict(self)
+    
 class SearchFilters(BaseModel):
     """Search filters for employee queries"""
+    model_config = ConfigDict(frozen=True)
+    
     department: Optional[str] = None
     location: Optional[str] = None
     position: Optional[str] = None
@@ -210,7 +283,20 @@ class SearchFilters(BaseModel):
     performance_rating_min: Optional[int] = None
     performance_rating_max: Optional[int] = None
 
-class SearchResult(BaseModel):
+# Shared all-default instances for queries where nothing was extracted; both classes are frozen
+_EMPTY_ENTITIES = QueryEntities()
+_EMPTY_FILTERS = SearchFilters()
+
+def empty_entities() -> QueryEntities:
+    """Return the shared QueryEntities with no extracted entities"""
+    return _EMPTY_ENTITIES
+
+def empty_filters() -> SearchFilters:
+    """Return the shared SearchFilters with no filters set"""
+    return _EMPTY_FILTERS
+
+@dataclass(slots=True)
+class SearchResult:
     """Individual search result"""
     id: str
     employee_id: str
@@ -225,6 +311,13 @@ class SearchResult(BaseModel):
     performance_rating: Optional[int] = None
     score: float = 0.0
     reranker_score: Optional[float] = None
+    
+    def to_dict(self, exclude_none: bool = False) -> Dict[str, Any]:
+        """Convert search result to dictionary, optionally dropping unset (None) fields"""
+        # All fields are scalars, so skip asdict()'s recursive copy
+        if exclude_none:
+            return {name: value for name in self.__slots__ if (value := getattr(self, name)) is not None}
+        return {name: getattr(self, name) for name in self.__slots__}
 
 class QueryRequest(BaseModel):
     """Query request model"""
@@ -290,7 +383,7 @@ class HealthResponse(BaseModel):
     status: str
     message: str
     version: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: AwareDatetime = Field(default_factory=_now)
     services: Optional[Dict[str, str]] = None
 
 class ErrorResponse(BaseModel):
@@ -298,26 +391,24 @@ class ErrorResponse(BaseModel):
     error: str
     message: str
     status_code: int
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: AwareDatetime = Field(default_factory=_now)
     details: Optional[Dict[str, Any]] = None
 
 # Validators
+def validate_query(query: str) -> bool:
+    """Validate query string"""
+    # isspace() short-circuits and, unlike strip(), never copies the string
+    return bool(query) and len(query) <= 500 and not query.isspace()
+
+def validate_top_k(top_k: int) -> bool:
+    """Validate top_k parameter"""
+    return 1 <= top_k <= 50
+
 class QueryRequestValidator:
     """Validates query requests"""
     
-    @staticmethod
-    def validate_query(query: str) -> bool:
-        """Validate query string"""
-        if not query or len(query.strip()) == 0:
-            return False
-        if len(query) > 500:
-            return False
-        return True
-    
-    @staticmethod
-    def validate_top_k(top_k: int) -> bool:
-        """Validate top_k parameter"""
-        return 1 <= top_k <= 50
+    validate_query = staticmethod(validate_query)
+    validate_top_k = staticmethod(validate_top_k)
 
 # Configuration models
 class DatabaseConfig(BaseModel):
@@ -1,6 +1,10 @@
 # src/database/collections.py
-from typing import Dict, List, Any, Optional
+import asyncio
+import copy
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from cachetools import TTLCache
+from pymongo import UpdateOne
 import sys
 import os
 
@@ -8,6 +12,14 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.database.mongodb_client import mongodb_client
 
+# Complete profiles kept in memory between requests
+PROFILE_CACHE_SIZE = 10000
+PROFILE_CACHE_TTL = 300
+
+# Records which source workbook the search index was last built from
+PIPELINE_STATE_COLLECTION = "pipeline_state"
+SEARCH_INDEX_STATE_ID = "search_index"
+
 class EmployeeCollections:
     """Handles all employee-related collections"""
     
@@ -24,216 +36,279 @@ class EmployeeCollections:
             'attrition': 'attrition',
             'project_history': 'project_history'
         }
+        # Recently built complete profiles, keyed by employee_id
+        self._profile_cache = TTLCache(maxsize=PROFILE_CACHE_SIZE, ttl=PROFILE_CACHE_TTL)
+        # Profile builds in flight, so concurrent misses for one employee share a single fetch
+        self._profile_tasks: Dict[str, asyncio.Future] = {}
+    
+    # Equality-filter fields, beyond employee_id, that need a regular index on each collection
+    FILTER_INDEX_FIELDS = {
+        'employment': ("department", "role", "manager_id"),
+        'attrition': ("exit_intent_flag",)
+    }
+    
+    # Fields each one-to-one section contributes to get_complete_employee_profile
+    PROFILE_FIELDS = {
+        'personal_info': ("full_name", "email", "location", "age", "gender", "contact_number", "address"),
+        'employment': ("department", "role", "grade_band", "employment_type", "manager_id", "joining_date", "work_mode"),
+        'learning': ("certifications", "courses_completed", "learning_hours_ytd", "internal_trainings"),
+        'experience': ("total_experience_years", "years_in_current_company", "years_in_current_skillset",
+                       "known_skills_count", "previous_companies_resigned"),
+        'performance': ("performance_rating", "kpis_met_pct", "promotions_count", "awards",
+                        "improvement_areas", "last_review_date"),
+        'engagement': ("current_project", "allocation_percentage", "peer_review_score", "manager_feedback",
+                       "engagement_score", "days_on_bench"),
+        'compensation': ("current_salary", "bonus", "total_ctc", "currency", "last_appraisal_date"),
+        'attendance': ("monthly_attendance_pct", "leave_days_taken", "leave_balance", "leave_pattern"),
+        'attrition': ("attrition_risk_score", "exit_intent_flag", "retention_plan", "internal_transfers")
+    }
     
-    async def get_employee_personal_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    # Projections fetching only those fields; employee_id keeps a matched document non-empty
+    PROFILE_PROJECTIONS = {
+        section: {"_id": 0, "employee_id": 1, **{name: 1 for name in fields}}
+        for section, fields in PROFILE_FIELDS.items()
+    }
+    
+    async def get_employee_personal_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee personal information"""
         return await mongodb_client.find_document(
             self.collections['personal_info'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_employment_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_employment_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee employment information"""
         return await mongodb_client.find_document(
             self.collections['employment'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_learning_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_learning_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee learning and certifications"""
         return await mongodb_client.find_document(
             self.collections['learning'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_experience_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_experience_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee experience information"""
         return await mongodb_client.find_document(
             self.collections['experience'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_performance_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_performance_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee performance information"""
         return await mongodb_client.find_document(
             self.collections['performance'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_engagement_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_engagement_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee engagement information"""
         return await mongodb_client.find_document(
             self.collections['engagement'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_compensation_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_compensation_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee compensation information"""
         return await mongodb_client.find_document(
             self.collections['compensation'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_attendance_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_attendance_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee attendance information"""
         return await mongodb_client.find_document(
             self.collections['attendance'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_attrition_info(self, employee_id: str) -> Optional[Dict[str, Any]]:
+    async def get_employee_attrition_info(self, employee_id: str, projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
         """Get employee attrition risk information"""
         return await mongodb_client.find_document(
             self.collections['attrition'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_employee_project_history(self, employee_id: str) -> List[Dict[str, Any]]:
+    async def get_employee_project_history(self, employee_id: str, projection: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Get employee project history"""
         return await mongodb_client.find_documents(
             self.collections['project_history'], 
-            {"employee_id": employee_id}
+            {"employee_id": employee_id},
+            projection=projection
         )
     
-    async def get_complete_employee_profile(self, employee_id: str) -> Dict[str, Any]:
-        """Get complete employee profile from all collections"""
-        profile = {"employee_id": employee_id}
+    async def get_section_documents(self, collection_type: str, employee_ids: Optional[List[str]] = None,
+                                    projection: Dict[str, Any] = None) -> Dict[str, Dict[str, Any]]:
+        """Get one collection's documents for many employees in a single query, keyed by employee_id.
         
-        # Personal Info
-        personal = await self.get_employee_personal_info(employee_id)
-        if personal:
-            profile.update({
-                "full_name": personal.get("full_name"),
-                "email": personal.get("email"),
-                "location": personal.get("location"),
-                "age": personal.get("age"),
-                "gender": personal.get("gender"),
-                "contact_number": personal.get("contact_number"),
-                "address": personal.get("address")
-            })
-        
-        # Employment Info
-        employment = await self.get_employee_employment_info(employee_id)
-        if employment:
-            profile.update({
-                "department": employment.get("department"),
-                "role": employment.get("role"),
-                "grade_band": employment.get("grade_band"),
-                "employment_type": employment.get("employment_type"),
-                "manager_id": employment.get("manager_id"),
-                "joining_date": employment.get("joining_date"),
-                "work_mode": employment.get("work_mode")
-            })
+        With no employee_ids the whole collection is read, which avoids shipping a
+        huge $in list when every employee is wanted.
+        """
+        documents = await mongodb_client.find_documents(
+            self.collections[collection_type],
+            {"employee_id": {"$in": employee_ids}} if employee_ids is not None else {},
+            projection=projection
+        )
+        by_employee: Dict[str, Dict[str, Any]] = {}
+        for doc in documents:
+            # Keep the first match, as the single-employee getters do
+            by_employee.setdefault(doc.get("employee_id"), doc)
+        return by_employee
+    
+    async def _get_joined_profile_sections(self, employee_id: str) -> Optional[List[Any]]:
+        """Fetch every profile section in one round trip with $lookup joins from personal_info.
         
-        # Learning Info
-        learning = await self.get_employee_learning_info(employee_id)
-        if learning:
-            profile.update({
-                "certifications": learning.get("certifications"),
-                "courses_completed": learning.get("courses_completed"),
-                "learning_hours_ytd": learning.get("learning_hours_ytd"),
-                "internal_trainings": learning.get("internal_trainings")
-            })
+        Returns None when there is no personal_info document to join from or the
+        aggregation fails, so the caller can fall back to per-collection lookups.
+        """
+        joined = list(self.collections)[1:]
+        projections = self.PROFILE_PROJECTIONS
+        pipeline = [
+            {"$match": {"employee_id": employee_id}},
+            {"$limit": 1},
+            {"$project": projections['personal_info']}
+        ] + [
+            {"$lookup": {
+                "from": self.collections[name],
+                "localField": "employee_id",
+                "foreignField": "employee_id",
+                "pipeline": [{"$project": projections[name]}] if name in projections else [],
+                "as": name
+            }}
+            for name in joined
+        ]
         
-        # Experience Info
-        experience = await self.get_employee_experience_info(employee_id)
-        if experience:
-            profile.update({
-                "total_experience_years": experience.get("total_experience_years"),
-                "years_in_current_company": experience.get("years_in_current_company"),
-                "years_in_current_skillset": experience.get("years_in_current_skillset"),
-                "known_skills_count": experience.get("known_skills_count"),
-                "previous_companies_resigned": experience.get("previous_companies_resigned")
-            })
+        try:
+            collection = await mongodb_client.get_collection(self.collections['personal_info'])
+            documents = await collection.aggregate(pipeline).to_list(length=1)
+        except Exception as e:
+            print(f"❌ Error joining employee profile: {e}")
+            return None
+        if not documents:
+            return None
         
-        # Performance Info
-        performance = await self.get_employee_performance_info(employee_id)
-        if performance:
-            profile.update({
-                "performance_rating": performance.get("performance_rating"),
-                "kpis_met_pct": performance.get("kpis_met_pct"),
-                "promotions_count": performance.get("promotions_count"),
-                "awards": performance.get("awards"),
-                "improvement_areas": performance.get("improvement_areas"),
-                "last_review_date": performance.get("last_review_date")
-            })
+        personal = documents[0]
+        sections = [personal]
+        for name in joined:
+            matches = personal.pop(name)
+            if name == 'project_history':
+                sections.append(matches)
+            else:
+                sections.append(matches[0] if matches else None)
+        return sections
+    
+    async def _get_profile_sections(self, employee_id: str) -> List[Any]:
+        """Fetch every profile section with concurrent per-collection lookups"""
+        projections = self.PROFILE_PROJECTIONS
+        return await asyncio.gather(
+            self.get_employee_personal_info(employee_id, projections['personal_info']),
+            self.get_employee_employment_info(employee_id, projections['employment']),
+            self.get_employee_learning_info(employee_id, projections['learning']),
+            self.get_employee_experience_info(employee_id, projections['experience']),
+            self.get_employee_performance_info(employee_id, projections['performance']),
+            self.get_employee_engagement_info(employee_id, projections['engagement']),
+            self.get_employee_compensation_info(employee_id, projections['compensation']),
+            self.get_employee_attendance_info(employee_id, projections['attendance']),
+            self.get_employee_attrition_info(employee_id, projections['attrition']),
+            self.get_employee_project_history(employee_id)
+        )
+    
+    async def get_complete_employee_profile(self, employee_id: str) -> Dict[str, Any]:
+        """Get complete employee profile from all collections, cached for PROFILE_CACHE_TTL seconds"""
+        profile = self._profile_cache.get(employee_id)
+        if profile is not None:
+            # Callers may modify the profile, so never hand out the cached dict itself
+            return copy.deepcopy(profile)
         
-        # Engagement Info
-        engagement = await self.get_employee_engagement_info(employee_id)
-        if engagement:
-            profile.update({
-                "current_project": engagement.get("current_project"),
-                "allocation_percentage": engagement.get("allocation_percentage"),
-                "peer_review_score": engagement.get("peer_review_score"),
-                "manager_feedback": engagement.get("manager_feedback"),
-                "engagement_score": engagement.get("engagement_score"),
-                "days_on_bench": engagement.get("days_on_bench")
-            })
+        task = self._profile_tasks.get(employee_id)
+        if task is None:
+            task = asyncio.ensure_future(self._build_complete_employee_profile(employee_id))
+            self._profile_tasks[employee_id] = task
+            task.add_done_callback(lambda done: self._finish_profile_task(employee_id, done))
+        # Shield the shared fetch so one cancelled caller does not cancel it for the others
+        return copy.deepcopy(await asyncio.shield(task))
+    
+    def _finish_profile_task(self, employee_id: str, task: asyncio.Future):
+        """Cache a finished profile build and forget the in-flight task"""
+        # A build invalidated while in flight may hold pre-update data, so it is not cached
+        if self._profile_tasks.get(employee_id) is not task:
+            return
+        del self._profile_tasks[employee_id]
+        if not task.cancelled() and task.exception() is None:
+            self._profile_cache[employee_id] = task.result()
+    
+    def invalidate_profile_cache(self, employee_id: Optional[str] = None):
+        """Drop one cached profile, or all of them when no employee_id is given.
         
-        # Compensation Info (be careful with sensitive data)
-        compensation = await self.get_employee_compensation_info(employee_id)
-        if compensation:
-            profile.update({
-                "current_salary": compensation.get("current_salary"),
-                "bonus": compensation.get("bonus"),
-                "total_ctc": compensation.get("total_ctc"),
-                "currency": compensation.get("currency"),
-                "last_appraisal_date": compensation.get("last_appraisal_date")
-            })
+        In-flight builds are forgotten too, so their results are never cached.
+        """
+        if employee_id is None:
+            self._profile_cache.clear()
+            self._profile_tasks.clear()
+        else:
+            self._profile_cache.pop(employee_id, None)
+            self._profile_tasks.pop(employee_id, None)
+    
+    async def _build_complete_employee_profile(self, employee_id: str) -> Dict[str, Any]:
+        """Build the complete employee profile from the database"""
+        sections = await self._get_joined_profile_sections(employee_id)
+        if sections is None:
+            sections = await self._get_profile_sections(employee_id)
         
-        # Attendance Info
-        attendance = await self.get_employee_attendance_info(employee_id)
-        if attendance:
-            profile.update({
-                "monthly_attendance_pct": attendance.get("monthly_attendance_pct"),
-                "leave_days_taken": attendance.get("leave_days_taken"),
-                "leave_balance": attendance.get("leave_balance"),
-                "leave_pattern": attendance.get("leave_pattern")
-            })
+        *section_docs, projects = sections
+        profile = {"employee_id": employee_id}
         
-        # Attrition Info
-        attrition = await self.get_employee_attrition_info(employee_id)
-        if attrition:
-            profile.update({
-                "attrition_risk_score": attrition.get("attrition_risk_score"),
-                "exit_intent_flag": attrition.get("exit_intent_flag"),
-                "retention_plan": attrition.get("retention_plan"),
-                "internal_transfers": attrition.get("internal_transfers")
-            })
+        # One-to-one sections, in PROFILE_FIELDS order; absent fields of a present section are None
+        for fields, doc in zip(self.PROFILE_FIELDS.values(), section_docs):
+            if doc:
+                profile.update({name: doc.get(name) for name in fields})
         
         # Project History
-        projects = await self.get_employee_project_history(employee_id)
         profile["project_history"] = projects
         
         return profile
     
+    async def _get_distinct_employee_ids(self, collection_name: str) -> List[str]:
+        """Get the distinct employee IDs stored in one collection"""
+        try:
+            collection = await mongodb_client.get_collection(collection_name)
+            return await collection.distinct("employee_id")
+        except Exception as e:
+            print(f"❌ Error getting employee IDs from {collection_name}: {e}")
+            return []
+    
     async def get_all_employee_ids(self) -> List[str]:
         """Get all unique employee IDs across collections"""
-        employee_ids = set()
-        
-        for collection_name in self.collections.values():
-            try:
-                documents = await mongodb_client.find_documents(
-                    collection_name, 
-                    {}, 
-                    limit=None
-                )
-                for doc in documents:
-                    if doc.get("employee_id"):
-                        employee_ids.add(doc["employee_id"])
-            except Exception as e:
-                print(f"❌ Error getting employee IDs from {collection_name}: {e}")
+        results = await asyncio.gather(*(
+            self._get_distinct_employee_ids(collection_name)
+            for collection_name in self.collections.values()
+        ))
         
+        employee_ids = set()
+        for ids in results:
+            employee_ids.update(employee_id for employee_id in ids if employee_id)
         return list(employee_ids)
     
     async def get_employees_by_department(self, department: str) -> List[str]:
         """Get employee IDs by department"""
         try:
-            documents = await mongodb_client.find_documents(
+            return await mongodb_client.find_field_values(
                 self.collections['employment'], 
-                {"department": department}
+                {"department": department},
+                "employee_id"
             )
-            return [doc["employee_id"] for doc in documents if doc.get("employee_id")]
         except Exception as e:
             print(f"❌ Error getting employees by department: {e}")
             return []
@@ -241,23 +316,52 @@ class EmployeeCollections:
     async def get_employees_by_role(self, role: str) -> List[str]:
         """Get employee IDs by role"""
         try:
-            documents = await mongodb_client.find_documents(
+            return await mongodb_client.find_field_values(
                 self.collections['employment'], 
-                {"role": role}
+                {"role": role},
+                "employee_id"
             )
-            return [doc["employee_id"] for doc in documents if doc.get("employee_id")]
         except Exception as e:
             print(f"❌ Error getting employees by role: {e}")
             return []
     
+    async def _get_employees_grouped_by(self, field_name: str, values: List[str]) -> Dict[str, List[str]]:
+        """Get employee IDs for several values of an employment field with a single $in query"""
+        grouped: Dict[str, List[str]] = {value: [] for value in values}
+        documents = await mongodb_client.find_documents(
+            self.collections['employment'],
+            {field_name: {"$in": list(grouped)}},
+            projection={"_id": 0, "employee_id": 1, field_name: 1}
+        )
+        for doc in documents:
+            if doc.get("employee_id"):
+                grouped[doc[field_name]].append(doc["employee_id"])
+        return grouped
+    
+    async def get_employees_by_departments(self, departments: List[str]) -> Dict[str, List[str]]:
+        """Get employee IDs for each of several departments in one round trip"""
+        try:
+            return await self._get_employees_grouped_by("department", departments)
+        except Exception as e:
+            print(f"❌ Error getting employees by departments: {e}")
+            return {}
+    
+    async def get_employees_by_roles(self, roles: List[str]) -> Dict[str, List[str]]:
+        """Get employee IDs for each of several roles in one round trip"""
+        try:
+            return await self._get_employees_grouped_by("role", roles)
+        except Exception as e:
+            print(f"❌ Error getting employees by roles: {e}")
+            return {}
+    
     async def get_employees_by_certification(self, certification: str) -> List[str]:
         """Get employee IDs by certification"""
         try:
-            documents = await mongodb_client.find_documents(
+            return await mongodb_client.find_field_values(
                 self.collections['learning'], 
-                {"certifications": {"$regex": certification, "$options": "i"}}
+                {"certifications": {"$regex": certification, "$options": "i"}},
+                "employee_id"
             )
-            return [doc["employee_id"] for doc in documents if doc.get("employee_id")]
         except Exception as e:
             print(f"❌ Error getting employees by certification: {e}")
             return []
@@ -265,11 +369,11 @@ class EmployeeCollections:
     async def get_employees_by_location(self, location: str) -> List[str]:
         """Get employee IDs by location"""
         try:
-            documents = await mongodb_client.find_documents(
+            return await mongodb_client.find_field_values(
                 self.collections['personal_info'], 
-                {"location": {"$regex": location, "$options": "i"}}
+                {"location": {"$regex": location, "$options": "i"}},
+                "employee_id"
             )
-            return [doc["employee_id"] for doc in documents if doc.get("employee_id")]
         except Exception as e:
             print(f"❌ Error getting employees by location: {e}")
             return []
@@ -278,19 +382,15 @@ class EmployeeCollections:
         """Get department-wise employee count"""
         try:
             pipeline = [
+                {"$match": {"department": {"$nin": [None, ""]}}},
                 {"$group": {"_id": "$department", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}}
             ]
             
             collection = await mongodb_client.get_collection(self.collections['employment'])
-            cursor = collection.aggregate(pipeline)
+            documents = await collection.aggregate(pipeline).to_list(length=None)
             
-            stats = {}
-            async for doc in cursor:
-                if doc["_id"]:  # Skip null departments
-                    stats[doc["_id"]] = doc["count"]
-            
-            return stats
+            return {doc["_id"]: doc["count"] for doc in documents}
         except Exception as e:
             print(f"❌ Error getting department statistics: {e}")
             return {}
@@ -299,19 +399,15 @@ class EmployeeCollections:
         """Get role-wise employee count"""
         try:
             pipeline = [
+                {"$match": {"role": {"$nin": [None, ""]}}},
                 {"$group": {"_id": "$role", "count": {"$sum": 1}}},
                 {"$sort": {"count": -1}}
             ]
             
             collection = await mongodb_client.get_collection(self.collections['employment'])
-            cursor = collection.aggregate(pipeline)
-            
-            stats = {}
-            async for doc in cursor:
-                if doc["_id"]:  # Skip null roles
-                    stats[doc["_id"]] = doc["count"]
+            documents = await collection.aggregate(pipeline).to_list(length=None)
             
-            return stats
+            return {doc["_id"]: doc["count"] for doc in documents}
         except Exception as e:
             print(f"❌ Error getting role statistics: {e}")
             return {}
@@ -331,10 +427,59 @@ class EmployeeCollections:
                 {"employee_id": employee_id},
                 update_data
             )
+            self.invalidate_profile_cache(employee_id)
+            if success:
+                await self.clear_search_index_fingerprint()
             return success
         except Exception as e:
             print(f"❌ Error updating employee data: {e}")
             return False
+    
+    async def update_employees_data(self, updates: List[Tuple[str, str, Dict[str, Any]]],
+                                    upsert: bool = False) -> int:
+        """Apply (employee_id, collection_type, update_data) updates with one bulk_write per collection.
+        
+        Returns the number of documents modified or upserted.
+        """
+        updated_at = datetime.utcnow().isoformat()
+        operations: Dict[str, List[UpdateOne]] = {}
+        for employee_id, collection_type, update_data in updates:
+            if collection_type not in self.collections:
+                print(f"❌ Invalid collection type: {collection_type}")
+                continue
+            operations.setdefault(self.collections[collection_type], []).append(UpdateOne(
+                {"employee_id": employee_id},
+                {"$set": {**update_data, "updated_at": updated_at}},
+                upsert=upsert
+            ))
+        
+        async def write(collection_name: str, requests: List[UpdateOne]) -> int:
+            try:
+                collection = await mongodb_client.get_collection(collection_name)
+                result = await collection.bulk_write(requests, ordered=False)
+                return result.modified_count + result.upserted_count
+            except Exception as e:
+                print(f"❌ Error bulk updating {collection_name}: {e}")
+                return 0
+        
+        counts = await asyncio.gather(*(write(name, requests) for name, requests in operations.items()))
+        for employee_id, _, _ in updates:
+            self.invalidate_profile_cache(employee_id)
+        updated = sum(counts)
+        if updated:
+            await self.clear_search_index_fingerprint()
+        return updated
+    
+    async def clear_search_index_fingerprint(self):
+        """Forget which workbook the search index matches, so the next pipeline run re-indexes"""
+        try:
+            collection = await mongodb_client.get_collection(PIPELINE_STATE_COLLECTION)
+            await collection.update_one(
+                {"_id": SEARCH_INDEX_STATE_ID},
+                {"$set": {"fingerprint": None, "updated_at": datetime.utcnow().isoformat()}}
+            )
+        except Exception as e:
+            print(f"❌ Error clearing search index fingerprint: {e}")
 
 # Global instance
 employee_collections = EmployeeCollections()
\ No newline at end of file
@@ -1,7 +1,10 @@
 # src/database/mongodb_client.py
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Dict, List, Any, Optional
+from pymongo.errors import BulkWriteError, PyMongoError
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from typing import Dict, List, Any, Optional, Tuple
 import sys
 import os
 
@@ -9,10 +12,67 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.core.config import settings
 
+# Fail fast instead of waiting on the driver's 30s server selection default
+SERVER_SELECTION_TIMEOUT_MS = 5000
+CONNECT_TIMEOUT_MS = 5000
+
+# Connection pool: keep warm sockets for the first requests and throttle new connection storms
+MAX_POOL_SIZE = 200
+MIN_POOL_SIZE = 10
+MAX_IDLE_TIME_MS = 300000
+MAX_CONNECTING = 4
+
+# Leaves documents as raw BSON so single fields can be read without decoding the rest
+RAW_BSON_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# Documents per insert_many call; keeps each batch well under the 16MB bulk limit
+INSERT_BATCH_SIZE = 1000
+
+# insert_many calls in flight at once for one insert_many_batched call
+MAX_CONCURRENT_INSERT_BATCHES = 4
+
+async def insert_many_batched(collection, documents: List[Dict[str, Any]]) -> Tuple[List[Any], List[Exception]]:
+    """Insert documents in concurrent unordered batches.
+    
+    Every batch runs to completion even if another fails, so the result is partial
+    rather than all-or-nothing: the ids that were inserted and the errors raised.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_INSERT_BATCHES)
+    
+    async def insert_batch(batch: List[Dict[str, Any]]) -> List[Any]:
+        async with semaphore:
+            try:
+                result = await collection.insert_many(batch, ordered=False)
+            except BulkWriteError as e:
+                # Unordered inserts still write every document that did not error
+                failed = {error["index"] for error in e.details.get("writeErrors", [])}
+                e.inserted_ids = [doc["_id"] for index, doc in enumerate(batch) if index not in failed and "_id" in doc]
+                raise
+            return result.inserted_ids
+    
+    results = await asyncio.gather(*(
+        insert_batch(documents[start:start + INSERT_BATCH_SIZE])
+        for start in range(0, len(documents), INSERT_BATCH_SIZE)
+    ), return_exceptions=True)
+    
+    inserted_ids, errors = [], []
+    for result in results:
+        if isinstance(result, Exception):
+            inserted_ids.extend(getattr(result, "inserted_ids", ()))
+            errors.append(result)
+        else:
+            inserted_ids.extend(result)
+    return inserted_ids, errors
+
 class MongoDBClient:
     _instance = None
     _client = None
     _db = None
+    _connect_lock = None
+    # Collection handles by name, reused for the lifetime of the connection
+    _collections: Dict[str, Any] = {}
+    # The same, decoding documents as raw BSON for find_field_values
+    _raw_collections: Dict[str, Any] = {}
     
     def __new__(cls):
         if cls._instance is None:
@@ -21,19 +81,42 @@ class MongoDBClient:
     
     async def connect(self):
         """Connect to MongoDB Atlas"""
-        if self._client is None:
+        if self._client is not None:
+            return True
+        # Created on first use so it belongs to the running event loop
+        if MongoDBClient._connect_lock is None:
+            MongoDBClient._connect_lock = asyncio.Lock()
+        async with MongoDBClient._connect_lock:
+            # Another coroutine may have connected while this one waited
+            if self._client is not None:
+                return True
+            client = None
             try:
-                self._client = AsyncIOMotorClient(settings.mongodb_connection_string)
-                self._db = self._client[settings.mongodb_database]
+                client = AsyncIOMotorClient(
+                    settings.mongodb_connection_string,
+                    serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                    connectTimeoutMS=CONNECT_TIMEOUT_MS,
+                    maxPoolSize=MAX_POOL_SIZE,
+                    minPoolSize=MIN_POOL_SIZE,
+                    maxIdleTimeMS=MAX_IDLE_TIME_MS,
+                    maxConnecting=MAX_CONNECTING
+                )
                 
                 # Test connection
-                await self._client.admin.command('ping')
+                await client.admin.command('ping')
+                
+                # Publish only a verified client, so waiters never see a half-open one
+                self._db = client[settings.mongodb_database]
+                self._client = client
                 print("✅ Connected to MongoDB Atlas")
                 return True
-            except Exception as e:
+            except PyMongoError as e:
                 print(f"❌ MongoDB connection failed: {e}")
+                if client is not None:
+                    client.close()
+                self._client = None
+                self._db = None
                 return False
-        return True
     
     async def disconnect(self):
         """Close MongoDB connection"""
@@ -41,6 +124,8 @@ class MongoDBClient:
             self._client.close()
             self._client = None
             self._db = None
+            self._collections = {}
+            self._raw_collections = {}
             print("🔐 MongoDB connection closed")
     
     @property
@@ -55,9 +140,12 @@ class MongoDBClient:
     
     async def get_collection(self, collection_name: str):
         """Get a specific collection"""
-        if self._db is None:
-            await self.connect()
-        return self._db[collection_name]
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            if self._db is None:
+                await self.connect()
+            collection = self._collections[collection_name] = self._db[collection_name]
+        return collection
     
     async def insert_document(self, collection_name: str, document: Dict[str, Any]) -> str:
         """Insert a single document"""
@@ -73,38 +161,51 @@ class MongoDBClient:
         """Insert multiple documents"""
         try:
             collection = await self.get_collection(collection_name)
-            result = await collection.insert_many(documents)
-            return [str(id) for id in result.inserted_ids]
+            inserted_ids, errors = await insert_many_batched(collection, documents)
+            for error in errors:
+                print(f"❌ Failed to insert document batch: {error}")
+            return [str(id) for id in inserted_ids]
         except Exception as e:
             print(f"❌ Failed to insert documents: {e}")
             return []
     
-    async def find_document(self, collection_name: str, filter_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Find a single document"""
+    async def find_document(self, collection_name: str, filter_dict: Dict[str, Any], projection: Dict[str, Any] = None) -> Optional[Dict[str, Any]]:
+        """Find a single document, optionally returning only the projected fields"""
         try:
             collection = await self.get_collection(collection_name)
-            document = await collection.find_one(filter_dict)
+            document = await collection.find_one(filter_dict, projection)
             return document
         except Exception as e:
             print(f"❌ Failed to find document: {e}")
             return None
     
-    async def find_documents(self, collection_name: str, filter_dict: Dict[str, Any] = None, limit: int = None) -> List[Dict[str, Any]]:
-        """Find multiple documents"""
+    async def find_documents(self, collection_name: str, filter_dict: Dict[str, Any] = None, limit: int = None, projection: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """Find multiple documents, optionally returning only the projected fields"""
         try:
             collection = await self.get_collection(collection_name)
-            cursor = collection.find(filter_dict or {})
+            cursor = collection.find(filter_dict or {}, projection)
             if limit:
                 cursor = cursor.limit(limit)
             
-            documents = []
-            async for doc in cursor:
-                documents.append(doc)
-            return documents
+            return await cursor.to_list(length=limit or None)
         except Exception as e:
             print(f"❌ Failed to find documents: {e}")
             return []
     
+    async def find_field_values(self, collection_name: str, filter_dict: Dict[str, Any], field_name: str) -> List[Any]:
+        """Return the truthy values of one field across matching documents, decoding only that field"""
+        try:
+            collection = self._raw_collections.get(collection_name)
+            if collection is None:
+                collection = (await self.get_collection(collection_name)).with_options(codec_options=RAW_BSON_OPTIONS)
+                self._raw_collections[collection_name] = collection
+            cursor = collection.find(filter_dict, {field_name: 1, "_id": 0})
+            documents = await cursor.to_list(length=None)
+            return [value for doc in documents if (value := doc.get(field_name))]
+        except Exception as e:
+            print(f"❌ Failed to find field values: {e}")
+            return []
+    
     async def update_document(self, collection_name: str, filter_dict: Dict[str, Any], update_dict: Dict[str, Any]) -> bool:
         """Update a single document"""
         try:
@@ -135,6 +236,15 @@ class MongoDBClient:
             print(f"❌ Failed to count documents: {e}")
             return 0
     
+    async def estimated_count(self, collection_name: str) -> int:
+        """Approximate collection size from metadata, without scanning documents"""
+        try:
+            collection = await self.get_collection(collection_name)
+            return await collection.estimated_document_count()
+        except Exception as e:
+            print(f"❌ Failed to estimate document count: {e}")
+            return 0
+    
     async def get_collections(self) -> List[str]:
         """Get list of all collections"""
         try:
@@ -34,6 +34,14 @@ class OllamaHRQueryEngine:
         self.skills = ["PMP", "GCP", "AWS", "Azure", "Python", "Java", "JavaScript", "SQL", "Docker", "Kubernetes"]
         self.locations = ["Remote", "Onshore", "Offshore", "New York", "California", "India", "Chennai", "Hyderabad"]
         
+        # Query handlers by intent; anything else falls back to a plain search
+        self._intent_handlers = {
+            "comparison": self._handle_comparison_query,
+            "ranking": self._handle_ranking_query,
+            "count_query": self._handle_count_query,
+            "analytics": self._handle_analytics_query
+        }
+        
         print("✅ Ollama-based HR Query Engine ready!")
     
     async def process_query(self, query: str) -> Dict[str, Any]:
@@ -51,27 +59,19 @@ class OllamaHRQueryEngine:
         try:
             print(f"\n🔍 Processing query with Ollama: '{query}'")
             
-            # Step 1: Analyze query using Ollama
-            analysis = self.ai_client.analyze_query_intent(query)
+            # Step 1: Analyze query using Ollama (blocking HTTP, so off the event loop)
+            analysis = await asyncio.to_thread(self.ai_client.analyze_query_intent, query)
             print(f"   🎯 Intent: {analysis['intent']}")
             print(f"   📋 Fields: {analysis.get('fields_to_analyze', [])}")
             print(f"   🔧 Filters: {analysis.get('filters', {})}")
             
             # Step 2: Route to appropriate handler
             intent = analysis['intent']
-            if intent == "comparison":
-                results, count = await self._handle_comparison_query(analysis)
-            elif intent == "ranking":
-                results, count = await self._handle_ranking_query(analysis)
-            elif intent == "count_query":
-                results, count = await self._handle_count_query(analysis)
-            elif intent == "analytics":
-                results, count = await self._handle_analytics_query(analysis)
-            else:
-                results, count = await self._handle_search_query(analysis)
+            handler = self._intent_handlers.get(intent, self._handle_search_query)
+            results, count = await handler(analysis)
             
             # Step 3: Generate response using Ollama
-            response = self.ai_client.generate_response(query, results, count, intent)
+            response = await asyncio.to_thread(self.ai_client.generate_response, query, results, count, intent)
             
             execution_time = (time.time() - start_time) * 1000
             
@@ -151,19 +151,9 @@ class OllamaHRQueryEngine:
                 pipeline.append({"$match": match_conditions})
                 print(f"   🎯 Applied filters: {match_conditions}")
             
-            # Add count stage
-            pipeline.append({"$count": "total"})
-            
-            # Execute aggregation
-            collection = await mongodb_client.get_collection("employee_personal_info")
-            cursor = collection.aggregate(pipeline)
-            results = await cursor.to_list(length=None)
-            
-            count = results[0]["total"] if results else 0
-            
-            # Get sample results for context (without count stage)
-            sample_pipeline = pipeline[:-1]  # Remove count stage
-            sample_pipeline.append({"$limit": 5})
+            # Count stage, plus sample results for context on the same filtered join
+            count_pipeline = pipeline + [{"$count": "total"}]
+            sample_pipeline = pipeline + [{"$limit": 5}]
             sample_pipeline.append({
                 "$project": {
                     "_id": {"$toString": "$_id"},
@@ -174,8 +164,14 @@ class OllamaHRQueryEngine:
                 }
             })
             
-            sample_cursor = collection.aggregate(sample_pipeline)
-            sample_results = await sample_cursor.to_list(length=None)
+            # The two aggregations are independent, so run them concurrently
+            collection = await mongodb_client.get_collection("employee_personal_info")
+            results, sample_results = await asyncio.gather(
+                collection.aggregate(count_pipeline).to_list(length=None),
+                collection.aggregate(sample_pipeline).to_list(length=None)
+            )
+            
+            count = results[0]["total"] if results else 0
             
             return sample_results, count
             
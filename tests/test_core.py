@@ -0,0 +1,144 @@
+# tests/test_core.py
+"""
+Core Model and Exception Tests
+
+Purpose:
+- Test Pydantic employee models accept the data shapes the system produces
+- Test custom exceptions behave like ordinary Python exceptions
+
+Test Coverage:
+- Date field parsing for ISO and legacy source formats
+- Complete profiles built from the flat profile shape
+- Exception pickling and copying, including read-only details
+- Database error translation in handle_database_error
+"""
+
+import copy
+import pickle
+import types
+import pytest
+from datetime import datetime
+from pydantic import ValidationError
+
+# Import components
+from src.core.models import CompleteEmployeeProfile, EmployeeEmploymentInfo, ProjectHistory
+from src.core.exceptions import (
+    AuthenticationException, DatabaseConnectionException, DatabaseException, DocumentInsertException,
+    DocumentNotFoundException, DocumentUpdateException, IntentDetectionException, MissingConfigException,
+    handle_database_error
+)
+
+class TestEmployeeModels:
+    """Test employee data models"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("value", ["15/03/2020", "15-03-2020", "15-Mar-2020", "15 Mar 2020", "2020/03/15", "2020-03-15"])
+    def test_joining_date_accepts_legacy_formats(self, value: str):
+        """Test date strings accepted before the fields were typed as datetime still validate"""
+        employment = EmployeeEmploymentInfo(employee_id="EMP0001", joining_date=value)
+        assert employment.joining_date == datetime(2020, 3, 15)
+
+    @pytest.mark.unit
+    def test_project_dates_parse_and_blank_is_none(self):
+        """Test project dates parse legacy strings and treat blanks as missing"""
+        project = ProjectHistory(employee_id="EMP0001", project_start_date="01/02/2021", project_end_date="  ")
+        assert project.project_start_date == datetime(2021, 2, 1)
+        assert project.project_end_date is None
+
+    @pytest.mark.unit
+    def test_unparseable_date_is_rejected(self):
+        """Test strings that are not dates still fail validation"""
+        with pytest.raises(ValidationError):
+            EmployeeEmploymentInfo(employee_id="EMP0001", joining_date="not a date")
+
+class TestCompleteEmployeeProfile:
+    """Test the sectioned complete employee profile model"""
+
+    @pytest.mark.unit
+    def test_flat_fields_fold_into_sections(self):
+        """Test the flat profile shape keeps its section fields instead of dropping them"""
+        profile = CompleteEmployeeProfile(
+            employee_id="EMP0001",
+            full_name="Jane Doe",
+            department="IT",
+            joining_date="15/03/2020",
+            performance_rating=4,
+            project_history=[{"employee_id": "EMP0001", "project_name": "Atlas"}]
+        )
+        assert profile.employment.department == "IT"
+        assert profile.employment.joining_date == datetime(2020, 3, 15)
+        assert profile.personal.full_name == "Jane Doe"
+        assert profile.department == "IT"
+        assert profile.performance_rating == 4
+        assert profile.learning is None
+        assert profile.project_history[0].project_name == "Atlas"
+
+    @pytest.mark.unit
+    def test_section_values_win_over_flat_values(self):
+        """Test a field given both flat and inside its section keeps the section value"""
+        profile = CompleteEmployeeProfile(
+            employee_id="EMP0001",
+            department="Sales",
+            employment={"employee_id": "EMP0001", "department": "IT", "role": "Developer"}
+        )
+        assert profile.employment.department == "IT"
+        assert profile.employment.role == "Developer"
+
+class TestExceptionSerialization:
+    """Test exceptions survive pickling and copying"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("exc", [
+        DatabaseConnectionException("connection refused"),
+        DocumentInsertException("employment", "duplicate key"),
+        IntentDetectionException("no intent found", "who is on leave"),
+        AuthenticationException(),
+        MissingConfigException("MONGODB_CONNECTION_STRING"),
+        DocumentUpdateException("employment", "EMP0001", "write conflict"),
+    ], ids=lambda exc: type(exc).__name__)
+    @pytest.mark.parametrize("round_trip", [
+        lambda exc: pickle.loads(pickle.dumps(exc)),
+        copy.copy,
+        copy.deepcopy,
+    ], ids=["pickle", "copy", "deepcopy"])
+    def test_round_trip_keeps_state(self, exc, round_trip):
+        """Test a round-tripped exception keeps its type, message and details"""
+        restored = round_trip(exc)
+        assert type(restored) is type(exc)
+        assert str(restored) == str(exc)
+        assert restored.to_dict() == exc.to_dict()
+        if exc._immutable_details:
+            assert isinstance(restored.details, types.MappingProxyType)
+
+class TestHandleDatabaseError:
+    """Test database error translation"""
+
+    @staticmethod
+    def _raising(error: Exception):
+        @handle_database_error
+        def operation():
+            raise error
+        return operation
+
+    @pytest.mark.unit
+    def test_connection_error_becomes_connection_exception(self):
+        """Test connection failures map to DatabaseConnectionException"""
+        with pytest.raises(DatabaseConnectionException):
+            self._raising(ConnectionError("refused"))()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("error", [KeyError("department"), IndexError("list index out of range")])
+    def test_lookup_errors_are_not_reported_as_missing_documents(self, error: Exception):
+        """Test programming errors surface as generic database errors, not 'document not found'"""
+        with pytest.raises(DatabaseException) as exc_info:
+            self._raising(error)()
+        assert type(exc_info.value) is DatabaseException
+        assert exc_info.value.__cause__ is error
+
+    @pytest.mark.unit
+    def test_database_exceptions_pass_through(self):
+        """Test an already specific database exception is re-raised unchanged"""
+        error = DocumentNotFoundException("employment", {"employee_id": "EMP0001"})
+        with pytest.raises(DocumentNotFoundException) as exc_info:
+            self._raising(error)()
+        assert exc_info.value is error
@@ -16,6 +16,7 @@ Test Coverage:
 - Document insertion, retrieval, update, deletion
 - Data validation and schema compliance
 - Employee profile aggregation across collections
+- Bulk updates, batched inserts and the profile cache against mocked collections
 - Error handling and edge cases
 """
 
@@ -24,9 +25,10 @@ import asyncio
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 import pymongo.errors
+from unittest.mock import patch, MagicMock, AsyncMock
 
 # Import fixtures and components
-from src.database.mongodb_client import MongoDBClient
+from src.database.mongodb_client import MongoDBClient, insert_many_batched
 from src.database.collections import EmployeeCollections
 from src.core.exceptions import (
     DatabaseException, DocumentNotFoundException, 
@@ -522,6 +524,105 @@ class TestDataIntegrity:
         assert len(duplicates) == 2
 
 
+class TestMockedCollectionOperations:
+    """Test bulk writes and caching against mocked collections, without a database"""
+    
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_update_employees_data_shares_timestamp_and_invalidates(self):
+        """Test one bulk_write per collection, one updated_at for the batch, and cache invalidation"""
+        collections = EmployeeCollections()
+        collections._profile_cache["EMP001"] = {"employee_id": "EMP001"}
+        collections._profile_cache["EMP003"] = {"employee_id": "EMP003"}
+        handles = {name: MagicMock() for name in ("employment", "performance")}
+        for handle in handles.values():
+            handle.bulk_write = AsyncMock(return_value=MagicMock(modified_count=1, upserted_count=0))
+        
+        with patch("src.database.collections.mongodb_client") as client, \
+                patch("src.database.collections.UpdateOne", side_effect=lambda *args, **kwargs: (args, kwargs)), \
+                patch.object(collections, "clear_search_index_fingerprint", AsyncMock()) as clear_fingerprint:
+            client.get_collection = AsyncMock(side_effect=lambda name: handles[name])
+            updated = await collections.update_employees_data([
+                ("EMP001", "employment", {"department": "IT"}),
+                ("EMP002", "employment", {"department": "Sales"}),
+                ("EMP001", "performance", {"performance_rating": 4}),
+                ("EMP001", "unknown", {"ignored": True}),
+            ])
+        
+        assert updated == 2
+        requests = [request for handle in handles.values() for request in handle.bulk_write.await_args.args[0]]
+        assert len(requests) == 3
+        assert len({args[1]["$set"]["updated_at"] for args, _ in requests}) == 1
+        assert "EMP001" not in collections._profile_cache
+        assert "EMP003" in collections._profile_cache
+        clear_fingerprint.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_insert_many_batched_reports_partial_results(self):
+        """Test a failed batch keeps the ids it did insert and the other batches still run"""
+        documents = [{"_id": index} for index in range(5)]
+        
+        async def insert_many(batch, ordered):
+            if batch[0]["_id"] == 2:
+                raise pymongo.errors.BulkWriteError({"writeErrors": [{"index": 1, "errmsg": "duplicate key"}]})
+            return MagicMock(inserted_ids=[doc["_id"] for doc in batch])
+        
+        collection = MagicMock()
+        collection.insert_many = AsyncMock(side_effect=insert_many)
+        with patch("src.database.mongodb_client.INSERT_BATCH_SIZE", 2):
+            inserted_ids, errors = await insert_many_batched(collection, documents)
+        
+        assert sorted(inserted_ids) == [0, 1, 2, 4]
+        assert len(errors) == 1
+        assert isinstance(errors[0], pymongo.errors.BulkWriteError)
+        assert collection.insert_many.await_count == 3
+    
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_concurrent_profile_misses_share_one_build(self):
+        """Test concurrent requests for one profile share a single fetch and get separate copies"""
+        collections = EmployeeCollections()
+        release = asyncio.Event()
+        
+        async def build(employee_id):
+            await release.wait()
+            return {"employee_id": employee_id, "skills": ["Python"]}
+        
+        with patch.object(collections, "_build_complete_employee_profile", AsyncMock(side_effect=build)) as build_profile:
+            requests = [asyncio.ensure_future(collections.get_complete_employee_profile("EMP001")) for _ in range(3)]
+            await asyncio.sleep(0)
+            release.set()
+            profiles = await asyncio.gather(*requests)
+            cached = await collections.get_complete_employee_profile("EMP001")
+        
+        assert build_profile.await_count == 1
+        assert profiles[0] == profiles[1] == cached
+        profiles[0]["skills"].append("SQL")
+        assert profiles[1]["skills"] == ["Python"]
+        assert collections._profile_cache["EMP001"]["skills"] == ["Python"]
+    
+    @pytest.mark.asyncio
+    @pytest.mark.unit
+    async def test_profile_invalidated_in_flight_is_not_cached(self):
+        """Test a build started before an update never lands in the cache"""
+        collections = EmployeeCollections()
+        release = asyncio.Event()
+        
+        async def build(employee_id):
+            await release.wait()
+            return {"employee_id": employee_id}
+        
+        with patch.object(collections, "_build_complete_employee_profile", AsyncMock(side_effect=build)):
+            request = asyncio.ensure_future(collections.get_complete_employee_profile("EMP001"))
+            await asyncio.sleep(0)
+            collections.invalidate_profile_cache("EMP001")
+            release.set()
+            await request
+        
+        assert "EMP001" not in collections._profile_cache
+        assert "EMP001" not in collections._profile_tasks
+
 class TestErrorHandling:
     """Test error handling and edge cases"""
     
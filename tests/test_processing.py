@@ -28,10 +28,11 @@ from typing import Dict, List, Any
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import openpyxl
 from unittest.mock import patch, MagicMock, AsyncMock
 
 # Import components
-from src.processing.etl_pipeline import ETLPipeline
+from src.processing.etl_pipeline import ETLPipeline, _read_worksheet
 from src.database.mongodb_client import MongoDBClient
 from src.database.collections import EmployeeCollections
 from src.core.exceptions import ETLException, DataValidationException, FileProcessingException
@@ -468,6 +469,29 @@ class TestExcelProcessing:
         emp2 = await mock_etl_pipeline.mongodb_client.find_document("special_chars", {"employee_id": "EMP002"})
         assert emp2["full_name"] == "李小明"
         assert "中文" in emp2["notes"]
+    
+    def test_read_worksheet_matches_read_excel_headers(self, temp_directory: str):
+        """Test the streaming sheet reader names and trims columns like pandas.read_excel"""
+        excel_path = os.path.join(temp_directory, "messy_headers.xlsx")
+        
+        # Blank and duplicate headers, an empty column and a formatting-only row
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.title = "Messy"
+        sheet.append(["employee_id", None, "skill", "skill", None])
+        sheet.append(["EMP001", "note", "Python", "SQL", None])
+        sheet.append(["EMP002", None, "Java", None, None])
+        sheet.append([None, None, None, None, None])
+        sheet.cell(row=4, column=1).number_format = "0.00"
+        workbook.save(excel_path)
+        
+        df = _read_worksheet(excel_path, "Messy")
+        expected = pd.read_excel(excel_path, sheet_name="Messy", engine="openpyxl").dropna(how="all")
+        
+        assert list(df.columns) == ["employee_id", "Unnamed: 1", "skill", "skill.1"]
+        assert list(df.columns) == list(expected.columns)
+        assert len(df) == 2
+        assert df.iloc[0].to_dict() == {"employee_id": "EMP001", "Unnamed: 1": "note", "skill": "Python", "skill.1": "SQL"}
 
 
 class TestIncrementalUpdates:
@@ -519,6 +543,68 @@ class TestIncrementalUpdates:
         assert "Employee ID required" in result["error"]
 
 
+class TestSearchIndexFingerprint:
+    """Test the search index is only rebuilt when the loaded workbook changed"""
+    
+    @staticmethod
+    def _pipeline(indexed_fingerprint, indexed_count: int):
+        pipeline = ETLPipeline()
+        pipeline._source_fingerprint = "workbook-a"
+        pipeline._indexed_fingerprint = indexed_fingerprint
+        pipeline._get_indexed_document_count = AsyncMock(return_value=indexed_count)
+        pipeline._set_indexed_fingerprint = AsyncMock()
+        return pipeline
+    
+    @staticmethod
+    def _indexer():
+        indexer = MagicMock()
+        for method in ("connect_to_mongodb", "create_or_update_index", "index_all_employees"):
+            setattr(indexer, method, AsyncMock(return_value=True))
+        indexer.verify_index = AsyncMock()
+        indexer.close_connections = AsyncMock()
+        return indexer
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_workbook_skips_reindex(self):
+        """Test an index built from the same workbook is kept"""
+        pipeline = self._pipeline("workbook-a", indexed_count=25)
+        indexer = self._indexer()
+        
+        with patch("src.processing.etl_pipeline.FixedAzureSearchIndexer", return_value=indexer):
+            await pipeline._create_search_index()
+        
+        indexer.index_all_employees.assert_not_awaited()
+        pipeline._set_indexed_fingerprint.assert_awaited_once_with("workbook-a")
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("indexed_fingerprint, indexed_count", [
+        ("workbook-b", 25),  # a different workbook was indexed
+        (None, 25),          # a record changed since the last indexing
+        ("workbook-a", 0),   # the index is empty or its size is unknown
+    ])
+    async def test_reindex_when_index_may_be_stale(self, indexed_fingerprint, indexed_count: int):
+        """Test the index is rebuilt whenever it cannot be shown to match the loaded workbook"""
+        pipeline = self._pipeline(indexed_fingerprint, indexed_count)
+        indexer = self._indexer()
+        
+        with patch("src.processing.etl_pipeline.FixedAzureSearchIndexer", return_value=indexer):
+            await pipeline._create_search_index()
+        
+        indexer.index_all_employees.assert_awaited_once()
+        pipeline._set_indexed_fingerprint.assert_awaited_once_with("workbook-a")
+    
+    @pytest.mark.asyncio
+    async def test_incremental_update_clears_fingerprint(self):
+        """Test an incremental update forgets which workbook the index matches"""
+        pipeline = ETLPipeline()
+        pipeline.employee_collections = MagicMock()
+        pipeline.employee_collections.clear_search_index_fingerprint = AsyncMock()
+        
+        result = await pipeline.run_incremental_update({"employee_id": "EMP001", "department": "Engineering"})
+        
+        assert result["status"] == "success"
+        pipeline.employee_collections.clear_search_index_fingerprint.assert_awaited_once()
+
 class TestPerformanceAndMemory:
     """Test ETL performance and memory usage"""
     